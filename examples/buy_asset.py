@@ -3,7 +3,6 @@
 
 import logging
 import os
-import time
 
 from ocean_keeper.diagnostics import Diagnostics
 from ocean_keeper.web3_provider import Web3Provider
@@ -119,17 +118,8 @@ def buy_asset():
     assert event, "Lock reward condition fulfilled event is not found, check the keeper node's logs"
     logging.info('Got lock reward event, next: wait for the access condition..')
 
-    event = keeper.access_secret_store_condition.subscribe_condition_fulfilled(
-        agreement_id, 15, None, (), wait=True
-    )
-    logging.info(f'Got access event {event}')
-    i = 0
-    while ocn.agreements.is_access_granted(
-            agreement_id, did, consumer_account.address) is not True and i < 15:
-        time.sleep(1)
-        i += 1
-
-    assert ocn.agreements.is_access_granted(agreement_id, did, consumer_account.address)
+    assert ocn.agreements.wait_for_access(agreement_id, did, consumer_account.address, 30)
+    logging.info('Got access.')
 
     ocn.assets.consume(
         agreement_id,
@@ -12,6 +12,7 @@ from ocean_utils.did_resolver.did_resolver import DIDResolver
 from squid_py.brizo import BrizoProvider
 from squid_py.ocean.keeper import SquidKeeper as Keeper
 from squid_py.secret_store import SecretStoreProvider
+from squid_py.utils.transactions import account_lock
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ def refund_reward(event, agreement_id, did, service_agreement, price, consumer_a
     :param publisher_address: ethereum account address of publisher, hex str
     :param condition_ids: is a list of bytes32 content-addressed Condition IDs, bytes32
     :param escrow_condition_id: hex str the id of escrow reward condition at this `agreement_id`
+    :return: bool True if the reward was refunded by this call
     """
     logger.debug(f"trigger refund (agreement {agreement_id}) after event {event}.")
     if Keeper.get_instance().condition_manager.get_condition_state(escrow_condition_id) > 1:
@@ -38,7 +40,7 @@ def refund_reward(event, agreement_id, did, service_agreement, price, consumer_a
             f'agreementId={agreement_id}, escrow reward conditionId={escrow_condition_id},'
             f' publisher={publisher_address}'
         )
-        return
+        return False
 
     access_id, lock_id = condition_ids[:2]
     name_to_parameter = {param.name: param for param in
@@ -50,20 +52,21 @@ def refund_reward(event, agreement_id, did, service_agreement, price, consumer_a
     assert price == service_agreement.get_price(), 'price mismatch.'
     try:
         escrow_condition = Keeper.get_instance().escrow_reward_condition
-        tx_hash = escrow_condition.fulfill(
-            agreement_id,
-            price,
-            Web3Provider.get_web3().toChecksumAddress(did_owner),
-            consumer_account.address,
-            lock_id,
-            access_id,
-            consumer_account
-        )
-        process_tx_receipt(
+        with account_lock(consumer_account.address):
+            tx_hash = escrow_condition.fulfill(
+                agreement_id,
+                price,
+                Web3Provider.get_web3().toChecksumAddress(did_owner),
+                consumer_account.address,
+                lock_id,
+                access_id,
+                consumer_account
+            )
+        return bool(process_tx_receipt(
             tx_hash,
             getattr(escrow_condition.contract.events, escrow_condition.FULFILLED_EVENT)(),
             'EscrowReward.Fulfilled'
-        )
+        ))
     except Exception as e:
         logger.error(
             f'Error when doing escrow_reward_condition.fulfills (agreementId {agreement_id}): {e}',
@@ -85,6 +88,7 @@ def consume_asset(event, agreement_id, did, service_agreement, consumer_account,
     :param secret_store_url: str URL of secret store node for retrieving decryption keys
     :param parity_url: str URL of parity client to use for secret store encrypt/decrypt
     :param downloads_path: str path to save downloaded files
+    :return: result of `consume_callback`, None if there is none
     """
     logger.debug(f"consuming asset (agreementId {agreement_id}) after event {event}.")
     if consume_callback:
@@ -93,7 +97,7 @@ def consume_asset(event, agreement_id, did, service_agreement, consumer_account,
         )
         brizo = BrizoProvider.get_brizo()
 
-        consume_callback(
+        return consume_callback(
             agreement_id,
             service_agreement.service_definition_id,
             DIDResolver(Keeper.get_instance().did_registry).resolve(did),
@@ -24,11 +24,12 @@ def execute_computation(event, agreement_id, did, service_agreement, consumer_ac
     :param secret_store_url: str URL of secret store node for retrieving decryption keys
     :param parity_url: str URL of parity client to use for secret store encrypt/decrypt
     :param downloads_path: str path to save downloaded files
+    :return: result of `consume_callback`, None if there is none
     """
     logger.debug(f"consuming asset (agreementId {agreement_id}) after event {event}.")
     if consume_callback:
         brizo = BrizoProvider.get_brizo()
-        consume_callback(
+        return consume_callback(
             agreement_id,
             DIDResolver(Keeper.get_instance().did_registry).resolve(did),
             DIDResolver(Keeper.get_instance().did_registry).resolve(workflow_did),
@@ -6,6 +6,7 @@ import logging
 from ocean_keeper.utils import process_fulfill_condition
 
 from squid_py.ocean.keeper import SquidKeeper as Keeper
+from squid_py.utils.transactions import account_lock
 
 logger = logging.getLogger(__name__)
 
@@ -19,31 +20,37 @@ def fulfill_lock_reward_condition(event, agreement_id, price, consumer_account,
     :param price: Asset price, int
     :param consumer_account: Account instance of the consumer
     :param lock_condition_id: hex str the id of the lock reward condition for this `agreement_id`
+    :return: bool True if the lock reward condition is fulfilled
     """
     if not event:
         logger.warning(
             f'`fulfill_lock_reward_condition` got empty event: event listener timed out.')
-        return
+        return False
 
     keeper = Keeper.get_instance()
-    if keeper.condition_manager.get_condition_state(lock_condition_id) > 1:
+    condition_state = keeper.condition_manager.get_condition_state(lock_condition_id)
+    if condition_state > 1:
         logger.debug(f'lock reward condition already fulfilled/aborted: '
                      f'agreementId={agreement_id}, lockReward conditionId={lock_condition_id}')
-        return
+        return condition_state == 2
 
     logger.debug(f"about to lock reward (agreement {agreement_id}) after event {event}.")
 
-    approved = keeper.token.token_approve(
-        keeper.lock_reward_condition.address, price, consumer_account)
-    logger.info(f'approval of token transfer was {"" if approved else "NOT"} successful')
-    args = (
-        agreement_id,
-        keeper.escrow_reward_condition.address,
-        price,
-        consumer_account
-    )
-    process_fulfill_condition(args, keeper.lock_reward_condition, lock_condition_id, logger, keeper,
-                              10)
+    # The agreements of a batch lock their rewards concurrently, the approve and fulfill
+    # transactions of the consumer are sent one agreement at a time.
+    with account_lock(consumer_account.address):
+        approved = keeper.token.token_approve(
+            keeper.lock_reward_condition.address, price, consumer_account)
+        logger.info(f'approval of token transfer was {"" if approved else "NOT"} successful')
+        args = (
+            agreement_id,
+            keeper.escrow_reward_condition.address,
+            price,
+            consumer_account
+        )
+        process_fulfill_condition(args, keeper.lock_reward_condition, lock_condition_id, logger,
+                                  keeper, 10)
+    return keeper.condition_manager.get_condition_state(lock_condition_id) == 2
 
 
 fulfillLockRewardCondition = fulfill_lock_reward_condition
@@ -28,9 +28,74 @@ class AssetConsumer:
         :param brizo: Brizo instance
         :param secret_store: SecretStore instance
         :param index: Index of the document that is going to be downloaded, int
+        :raises DownloadError: if any of the files could not be downloaded, the other ones are
+            saved in the asset folder
         :return: Asset folder path, str
         """
         did = ddo.did
+        consume_url, decrypted_content_urls = AssetConsumer._get_content_urls(ddo, secret_store)
+
+        if not os.path.isabs(destination):
+            destination = os.path.abspath(destination)
+        if not os.path.exists(destination):
+            os.mkdir(destination)
+
+        asset_folder = os.path.join(destination,
+                                    f'datafile.{did_to_id(did)}.{service_index}')
+        if not os.path.exists(asset_folder):
+            os.mkdir(asset_folder)
+        if index is not None:
+            assert isinstance(index, int), logger.error('index has to be an integer.')
+            assert index >= 0, logger.error('index has to be 0 or a positive integer.')
+            assert index < len(decrypted_content_urls), logger.error(
+                'index can not be bigger than the number of files')
+        # The downloads are verified against the contentLength and checksum of the files.
+        brizo.consume_service(
+            service_agreement_id,
+            consume_url,
+            consumer_account,
+            decrypted_content_urls,
+            asset_folder,
+            index,
+            files_metadata=ddo.metadata.get('main', {}).get('files')
+        )
+        return asset_folder
+
+    @staticmethod
+    def stream(service_agreement_id, ddo, consumer_account, brizo, secret_store, index=None):
+        """
+        Stream the content of the asset data files, without saving them on disk.
+
+        :param service_agreement_id: Service agreement id, str
+        :param ddo: DDO
+        :param consumer_account: Account instance of the consumer
+        :param brizo: Brizo instance
+        :param secret_store: SecretStore instance
+        :param index: Index of the document that is going to be streamed, int
+        :return: generator of StreamedFile (index, name, chunks), see `Brizo.consume_stream`
+        """
+        consume_url, decrypted_content_urls = AssetConsumer._get_content_urls(ddo, secret_store)
+        if index is not None:
+            assert isinstance(index, int), logger.error('index has to be an integer.')
+            assert index >= 0, logger.error('index has to be 0 or a positive integer.')
+            assert index < len(decrypted_content_urls), logger.error(
+                'index can not be bigger than the number of files')
+        return brizo.consume_stream(
+            service_agreement_id,
+            consume_url,
+            consumer_account,
+            decrypted_content_urls,
+            index,
+            files_metadata=ddo.metadata.get('main', {}).get('files')
+        )
+
+    @staticmethod
+    def _get_content_urls(ddo, secret_store):
+        """
+        :param ddo: DDO
+        :param secret_store: SecretStore instance
+        :return: tuple (consume endpoint of the access service, list of the decrypted files)
+        """
         encrypted_files = ddo.metadata['encryptedFiles']
         encrypted_files = (
             encrypted_files if isinstance(encrypted_files, str)
@@ -51,33 +116,10 @@ class AssetConsumer:
 
         # decrypt the contentUrls
         decrypted_content_urls = json.loads(
-            secret_store.decrypt_document(did_to_id(did), encrypted_files)
+            secret_store.decrypt_document(did_to_id(ddo.did), encrypted_files)
         )
 
         if isinstance(decrypted_content_urls, str):
             decrypted_content_urls = [decrypted_content_urls]
         logger.debug(f'got decrypted contentUrls: {decrypted_content_urls}')
-
-        if not os.path.isabs(destination):
-            destination = os.path.abspath(destination)
-        if not os.path.exists(destination):
-            os.mkdir(destination)
-
-        asset_folder = os.path.join(destination,
-                                    f'datafile.{did_to_id(did)}.{service_index}')
-        if not os.path.exists(asset_folder):
-            os.mkdir(asset_folder)
-        if index is not None:
-            assert isinstance(index, int), logger.error('index has to be an integer.')
-            assert index >= 0, logger.error('index has to be 0 or a positive integer.')
-            assert index < len(decrypted_content_urls), logger.error(
-                'index can not be bigger than the number of files')
-        brizo.consume_service(
-            service_agreement_id,
-            consume_url,
-            consumer_account,
-            decrypted_content_urls,
-            asset_folder,
-            index
-        )
-        return asset_folder
+        return consume_url, decrypted_content_urls
@@ -0,0 +1,55 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import json
+
+from ocean_utils.agreements.service_types import ServiceTypes
+from ocean_utils.ddo.ddo import DDO
+
+
+class AssetRecord:
+    """
+    Compact view of a DDO dictionary returned by an aquarius search.
+
+    The fields needed to list assets are read directly from the dictionary, the full DDO is
+    only built the first time it is needed. Any attribute not defined here is looked up on
+    that DDO, so a record can be used in place of a DDO.
+    """
+    __slots__ = ('_dictionary', '_ddo', 'did', 'name', 'type', 'author', 'price', 'date_created')
+
+    def __init__(self, dictionary):
+        """
+        :param dictionary: dict of the DDO as returned by aquarius
+        """
+        self._dictionary = dictionary
+        self._ddo = None
+        main = self._get_metadata_main(dictionary)
+        self.did = dictionary.get('id')
+        self.name = main.get('name')
+        self.type = main.get('type')
+        self.author = main.get('author')
+        self.price = main.get('price')
+        self.date_created = main.get('dateCreated')
+
+    @staticmethod
+    def _get_metadata_main(dictionary):
+        for service in dictionary.get('service', []):
+            if isinstance(service, str):
+                service = json.loads(service)
+            if service.get('type') == ServiceTypes.METADATA:
+                return service.get('attributes', {}).get('main', {})
+        return {}
+
+    @property
+    def ddo(self):
+        """The DDO instance of this asset, created on first access."""
+        if self._ddo is None:
+            self._ddo = DDO(dictionary=self._dictionary)
+        return self._ddo
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.ddo, name)
+
+    def __repr__(self):
+        return f'AssetRecord(did={self.did}, name={self.name})'
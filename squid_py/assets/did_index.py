@@ -0,0 +1,50 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import threading
+
+from ocean_utils.did import did_to_id
+
+
+class DIDIndex:
+    """
+    Local index of DIDs known to be registered.
+
+    DIDs are only ever added, the index is kept up to date incrementally by its owner. Once
+    `capacity` DIDs are stored the new ones are not indexed, they are then looked up like
+    unknown DIDs.
+    """
+
+    def __init__(self, capacity):
+        """
+        :param capacity: int maximum number of DIDs stored in the index
+        """
+        assert capacity > 0, f'Invalid capacity {capacity}, it must be a positive integer.'
+        self._capacity = capacity
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _to_id(did):
+        return did_to_id(did).lower()
+
+    def add(self, did):
+        """
+        :param did: DID, str
+        """
+        asset_id = self._to_id(did)
+        with self._lock:
+            if len(self._ids) < self._capacity:
+                self._ids.add(asset_id)
+
+    def update(self, dids):
+        """
+        :param dids: iterable of DID str
+        """
+        for did in dids:
+            self.add(did)
+
+    def __contains__(self, did):
+        return self._to_id(did) in self._ids
+
+    def __len__(self):
+        return len(self._ids)
@@ -3,21 +3,50 @@
 #  Copyright 2018 Ocean Protocol Foundation
 #  SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import json
 import logging
 import os
 import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from ocean_keeper.utils import add_ethereum_prefix_and_hash_msg
 from ocean_utils.agreements.service_agreement import ServiceAgreement
 from ocean_utils.exceptions import (OceanEncryptAssetUrlsError,
-                                    OceanInitializeServiceAgreementError)
+                                    OceanInitializeServiceAgreementError,
+                                    OceanServiceConsumeError)
 from ocean_utils.http_requests.requests_session import get_requests_session
 
+from squid_py.config_provider import ConfigProvider
 from squid_py.ocean.keeper import SquidKeeper as Keeper
+from squid_py.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+DownloadResult = namedtuple('DownloadResult', ('index', 'path', 'error', 'verified'))
+StreamedFile = namedtuple('StreamedFile', ('index', 'name', 'chunks'))
+
+
+class DownloadVerificationError(OceanServiceConsumeError):
+    """The downloaded content does not match the contentLength or checksum of its metadata."""
+
+
+class DownloadError(OceanServiceConsumeError):
+    """Some of the files of an asset could not be downloaded, see `results`."""
+
+    def __init__(self, results):
+        """
+        :param results: list of DownloadResult of all the requested files
+        """
+        self.results = results
+        failed = [result for result in results if result.error is not None]
+        OceanServiceConsumeError.__init__(
+            self,
+            f'{len(failed)} of {len(results)} files could not be downloaded: ' +
+            ', '.join(f'file {result.index} ({result.error})' for result in failed)
+        )
+
 
 class Brizo:
     """
@@ -30,6 +59,10 @@ class Brizo:
 
     """
     _http_client = get_requests_session()
+    MAX_DOWNLOAD_ATTEMPTS = 3
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    # Checksum algorithms of the hex digests without algorithm, by digest length.
+    CHECKSUM_ALGORITHMS = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
 
     @staticmethod
     def set_http_client(http_client):
@@ -100,22 +133,46 @@ class Brizo:
 
     @staticmethod
     def consume_service(service_agreement_id, service_endpoint, account, files,
-                        destination_folder, index=None):
+                        destination_folder, index=None, max_workers=None,
+                        max_bytes_per_second=None, files_metadata=None, chunk_size=None):
         """
         Call the brizo endpoint to get access to the different files that form the asset.
 
+        When `index` is None all the files are downloaded, `max_workers` at a time. The
+        download of the other files goes on when one of them fails.
+
         :param service_agreement_id: Service Agreement Id, str
         :param service_endpoint: Url to consume, str
         :param account: Account instance of the consumer signing this agreement, hex-str
         :param files: List containing the files to be consumed, list
         :param index: Index of the document that is going to be downloaded, int
         :param destination_folder: Path, str
-        :return: True if was downloaded, bool
+        :param max_workers: int maximum number of concurrent downloads, defaults to the
+            `downloads.max_workers` config option
+        :param max_bytes_per_second: int limit of the total download rate, 0 for no limit,
+            defaults to the `downloads.max_bytes_per_second` config option
+        :param files_metadata: list of the `files` entries of the asset metadata, in the same
+            order as `files`, whose `contentLength` and `checksum` are verified while the files
+            are downloaded
+        :param chunk_size: int bytes read from the network and written at once, defaults to
+            the `downloads.chunk_size` config option
+        :raises DownloadError: once all the files are processed, if any of them failed, its
+            `results` tell which ones
+        :return: list of DownloadResult, one per requested file with the path of the saved file
         """
         signature = Keeper.get_instance().sign_hash(
             add_ethereum_prefix_and_hash_msg(service_agreement_id),
             account)
 
+        if None in (max_workers, max_bytes_per_second, chunk_size):
+            config = ConfigProvider.get_config()
+            max_workers = max_workers or config.downloads_max_workers
+            chunk_size = chunk_size or config.downloads_chunk_size
+            if max_bytes_per_second is None:
+                max_bytes_per_second = config.downloads_max_bytes_per_second
+        rate_limiter = RateLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        files_metadata = Brizo._index_files_metadata(files_metadata or [])
+
         if index is not None:
             assert isinstance(index, int), logger.error('index has to be an integer.')
             assert index >= 0, logger.error('index has to be 0 or a positive integer.')
@@ -123,19 +180,140 @@ class Brizo:
                 'index can not be bigger than the number of files')
             consume_url = Brizo._create_consume_url(service_endpoint, service_agreement_id, account,
                                                     None, signature, index)
-            logger.info(f'invoke consume endpoint with this url: {consume_url}')
-            response = Brizo._http_client.get(consume_url, stream=True)
-            file_name = Brizo._get_file_name(response)
-            Brizo.write_file(response, destination_folder, file_name)
+            results = [Brizo._download_file(consume_url, destination_folder, index, None,
+                                            rate_limiter, files_metadata.get(index), chunk_size)]
         else:
-            for i, _file in enumerate(files):
+            def _download(i, _file):
                 consume_url = Brizo._create_consume_url(service_endpoint, service_agreement_id,
                                                         account, _file,
                                                         signature, i)
-                logger.info(f'invoke consume endpoint with this url: {consume_url}')
-                response = Brizo._http_client.get(consume_url, stream=True)
-                file_name = Brizo._get_file_name(response)
-                Brizo.write_file(response, destination_folder, file_name or f'file-{i}')
+                return Brizo._download_file(consume_url, destination_folder, i, f'file-{i}',
+                                            rate_limiter, files_metadata.get(i), chunk_size)
+
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as executor:
+                results = list(executor.map(_download, range(len(files)), files))
+
+        if any(result.error is not None for result in results):
+            raise DownloadError(results)
+        return results
+
+    @staticmethod
+    def _download_file(consume_url, destination_folder, index, default_file_name,
+                       rate_limiter=None, file_metadata=None, chunk_size=None):
+        logger.info(f'invoke consume endpoint with this url: {consume_url}')
+        try:
+            response = Brizo._http_client.get(consume_url, stream=True)
+            if response.status_code != 200:
+                raise OceanServiceConsumeError(
+                    f'consume failed: {response.reason}, status {response.status_code}')
+
+            file_name = Brizo._get_file_name(response) or default_file_name
+            path = Brizo.write_file(response, destination_folder, file_name, rate_limiter,
+                                    file_metadata, chunk_size, index)
+            content_length, checksum = Brizo._get_integrity_info(file_metadata or {})
+            verified = True if content_length is not None or checksum is not None else None
+            return DownloadResult(index, path, None, verified)
+        except DownloadVerificationError as e:
+            logger.error(f'Download of file {index} failed verification: {e}')
+            return DownloadResult(index, None, e, False)
+        except Exception as e:
+            logger.warning(f'Download of file {index} failed: {e}')
+            return DownloadResult(index, None, e, None)
+
+    @staticmethod
+    def _index_files_metadata(files_metadata):
+        """
+        :param files_metadata: list of the `files` entries of the asset metadata
+        :return: dict file index -> metadata entry, by the `index` of the entries or else by
+            their position
+        """
+        return {
+            entry.get('index', position): entry
+            for position, entry in enumerate(files_metadata) if isinstance(entry, dict)
+        }
+
+    @staticmethod
+    def consume_stream(service_agreement_id, service_endpoint, account, files, index=None,
+                       files_metadata=None, chunk_size=None):
+        """
+        Call the brizo endpoint to get access to the different files that form the asset, and
+        stream their content instead of saving it in files.
+
+        The files are requested one after the other as the generator is advanced, the response
+        of a file is closed when the next one is requested, so its chunks have to be consumed
+        before that.
+
+        :param service_agreement_id: Service Agreement Id, str
+        :param service_endpoint: Url to consume, str
+        :param account: Account instance of the consumer signing this agreement, hex-str
+        :param files: List containing the files to be consumed, list
+        :param index: Index of the document that is going to be streamed, None for all, int
+        :param files_metadata: list of the `files` entries of the asset metadata, in the same
+            order as `files`, whose `contentLength` and `checksum` are verified while the files
+            are streamed
+        :param chunk_size: int bytes of the chunks, defaults to the `downloads.chunk_size`
+            config option
+        :raises OceanServiceConsumeError: if a file cannot be consumed, or is interrupted
+        :raises DownloadVerificationError: at the end of the chunks of a file that does not
+            match its metadata
+        :return: generator of StreamedFile, the index and name of each file with an iterator
+            of the bytes chunks of its content
+        """
+        signature = Keeper.get_instance().sign_hash(
+            add_ethereum_prefix_and_hash_msg(service_agreement_id),
+            account)
+        chunk_size = chunk_size or ConfigProvider.get_config().downloads_chunk_size
+        files_metadata = Brizo._index_files_metadata(files_metadata or [])
+
+        if index is not None:
+            assert isinstance(index, int), logger.error('index has to be an integer.')
+            assert index >= 0, logger.error('index has to be 0 or a positive integer.')
+            assert index < len(files), logger.error(
+                'index can not be bigger than the number of files')
+
+        for i in ([index] if index is not None else range(len(files))):
+            consume_url = Brizo._create_consume_url(
+                service_endpoint, service_agreement_id, account,
+                files[i] if index is None else None, signature, i)
+            logger.info(f'invoke consume endpoint with this url: {consume_url}')
+            response = Brizo._http_client.get(consume_url, stream=True)
+            if response.status_code != 200:
+                response.close()
+                raise OceanServiceConsumeError(
+                    f'consume failed: {response.reason}, status {response.status_code}')
+
+            file_name = Brizo._get_file_name(response) or f'file-{i}'
+            chunks = Brizo._stream_content(response, file_name, chunk_size,
+                                           files_metadata.get(i))
+            try:
+                yield StreamedFile(i, file_name, chunks)
+            finally:
+                chunks.close()
+                response.close()
+
+    @staticmethod
+    def _stream_content(response, file_name, chunk_size, file_metadata=None):
+        content_length, checksum = Brizo._get_integrity_info(file_metadata or {})
+        expected_size = Brizo._get_expected_size(response)
+        hasher = hashlib.new(checksum[0]) if checksum else None
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                size += len(chunk)
+                if content_length is not None and size > content_length:
+                    raise DownloadVerificationError(
+                        f'{file_name} is longer than the metadata contentLength '
+                        f'{content_length}')
+                if hasher:
+                    hasher.update(chunk)
+                yield chunk
+        finally:
+            response.close()
+
+        if expected_size is not None and size < expected_size:
+            raise OceanServiceConsumeError(
+                f'download of {file_name} interrupted at byte {size} of {expected_size}')
+        Brizo._verify_content(file_name, size, hasher, content_length, checksum)
 
     @staticmethod
     def execute_service(service_agreement_id, service_endpoint, account, workflow_ddo):
@@ -245,21 +423,222 @@ class Brizo:
             logger.warning(f'It was not possible to get the file name. {e}')
 
     @staticmethod
-    def write_file(response, destination_folder, file_name):
+    def write_file(response, destination_folder, file_name, rate_limiter=None,
+                   file_metadata=None, chunk_size=None, index=None):
         """
         Write the response content in a file in the destination folder.
         :param response: Response
         :param destination_folder: Destination folder, string
         :param file_name: File name, string
-        :return: bool
+        :param rate_limiter: RateLimiter shared by the concurrent downloads, None for no limit
+        :param file_metadata: dict entry of the file in the asset metadata `files`, its
+            `contentLength` and `checksum` are verified while the content is written
+        :param chunk_size: int bytes read from the network and written at once, defaults to
+            `DOWNLOAD_CHUNK_SIZE`
+        :param index: int index of the file in the asset, keeps apart the partial downloads of
+            files with the same name
+        :raises DownloadVerificationError: if the content does not match `file_metadata`
+        :return: path of the saved file, None if the response is not successful
         """
-        if response.status_code == 200:
-            with open(os.path.join(destination_folder, file_name), 'wb') as f:
-                for chunk in response.iter_content(chunk_size=None):
-                    f.write(chunk)
-            logger.info(f'Saved downloaded file in {f.name}')
-        else:
+        if response.status_code != 200:
             logger.warning(f'consume failed: {response.reason}')
+            return None
+
+        chunk_size = chunk_size or Brizo.DOWNLOAD_CHUNK_SIZE
+        content_length, checksum = Brizo._get_integrity_info(file_metadata or {})
+        # The content is written in a `.part` file moved to `file_name` once complete. A `.part`
+        # file left by an interrupted download is resumed with a range request if the provider
+        # supports them, and so is a download interrupted now, up to MAX_DOWNLOAD_ATTEMPTS times.
+        # The range requests are conditioned with `If-Range` on the ETag or Last-Modified date
+        # of the content the `.part` file was started with, stored next to it, so a content
+        # changed since then is downloaded again from the start.
+        path = os.path.join(destination_folder, file_name)
+        part_path = f'{path}.part' if index is None else f'{path}.{index}.part'
+        url = getattr(response, 'url', None)
+        attempt = 1
+        try:
+            while True:
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                validator = Brizo._read_validator(part_path) if offset else None
+                if not validator:
+                    # The content of the `.part` file cannot be checked, it is not resumed.
+                    offset = 0
+                if attempt > 1 or (offset and url and Brizo._accepts_ranges(response) and
+                                   Brizo._get_validator(response) == validator):
+                    response.close()
+                    response = Brizo._http_client.get(
+                        url, stream=True,
+                        headers={'Range': f'bytes={offset}-', 'If-Range': validator}
+                        if offset else {})
+
+                try:
+                    if response.status_code == 206:
+                        logger.info(f'Resuming download of {file_name} from byte {offset}.')
+                        mode = 'ab'
+                    elif response.status_code == 200:
+                        mode = 'wb'
+                        Brizo._write_validator(part_path, Brizo._get_validator(response))
+                    elif response.status_code == 416 and offset:
+                        # The `.part` file is not a prefix of the current content.
+                        Brizo._remove_part(part_path)
+                        raise OceanServiceConsumeError(
+                            f'cannot resume {file_name} from byte {offset}')
+                    else:
+                        raise OceanServiceConsumeError(
+                            f'consume failed: {response.reason}, status {response.status_code}')
+
+                    expected_size = Brizo._get_expected_size(response)
+                    if None not in (expected_size, content_length) and \
+                            expected_size != content_length:
+                        raise DownloadVerificationError(
+                            f'{file_name} is {expected_size} bytes, the metadata contentLength '
+                            f'is {content_length}')
+
+                    hasher = hashlib.new(checksum[0]) if checksum else None
+                    if hasher and mode == 'ab':
+                        # Only the bytes downloaded by a previous attempt are read again.
+                        with open(part_path, 'rb') as f:
+                            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                                hasher.update(chunk)
+
+                    # The size of the `.part` file is the offset a later attempt resumes
+                    # from, so it only ever holds the bytes actually received.
+                    with open(part_path, mode, buffering=chunk_size) as f:
+                        size = f.seek(0, os.SEEK_END)
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            size += len(chunk)
+                            if content_length is not None and size > content_length:
+                                raise DownloadVerificationError(
+                                    f'{file_name} is longer than the metadata '
+                                    f'contentLength {content_length}')
+                            if rate_limiter is not None:
+                                rate_limiter.consume(len(chunk))
+                            if hasher:
+                                hasher.update(chunk)
+                            f.write(chunk)
+
+                    if expected_size is not None and size < expected_size:
+                        raise OceanServiceConsumeError(
+                            f'download of {file_name} interrupted at byte {size} of '
+                            f'{expected_size}')
+                    break
+                except DownloadVerificationError:
+                    raise
+                except Exception as e:
+                    if not url or attempt >= Brizo.MAX_DOWNLOAD_ATTEMPTS:
+                        raise
+                    logger.warning(f'Download of {file_name} failed ({e}), retrying.')
+                    attempt += 1
+
+            Brizo._verify_content(file_name, size, hasher, content_length, checksum)
+        except DownloadVerificationError:
+            Brizo._remove_part(part_path)
+            raise
+
+        os.replace(part_path, path)
+        Brizo._write_validator(part_path, None)
+        logger.info(f'Saved downloaded file in {path}')
+        return path
+
+    @staticmethod
+    def _verify_content(file_name, size, hasher, content_length, checksum):
+        """
+        :param file_name: File name, string
+        :param size: int number of bytes of the content
+        :param hasher: hashlib hash of the content, None if there is no checksum
+        :param content_length: int contentLength of the file metadata, None if unknown
+        :param checksum: tuple (hashlib algorithm name, hex digest) of the file metadata
+        :raises DownloadVerificationError: if the content does not match the metadata
+        """
+        if content_length is not None and size != content_length:
+            raise DownloadVerificationError(
+                f'{file_name} is {size} bytes, the metadata contentLength is {content_length}')
+        if hasher and hasher.hexdigest() != checksum[1]:
+            raise DownloadVerificationError(
+                f'{file_name} {checksum[0]} checksum {hasher.hexdigest()} does not match '
+                f'the metadata checksum {checksum[1]}')
+
+    @staticmethod
+    def _get_integrity_info(file_metadata):
+        """
+        :param file_metadata: dict entry of a file in the asset metadata `files`
+        :return: tuple (content_length, checksum), content_length is an int or None and
+            checksum a tuple (hashlib algorithm name, hex digest) or None
+        """
+        try:
+            content_length = int(file_metadata['contentLength'])
+        except (KeyError, TypeError, ValueError):
+            content_length = None
+
+        value = file_metadata.get('checksum')
+        if not isinstance(value, str) or not value:
+            return content_length, None
+
+        # The checksum is either "<algorithm>:<hex digest>" or a hex digest whose length gives
+        # the algorithm, unless `checksumType` is set.
+        algorithm = file_metadata.get('checksumType')
+        if ':' in value:
+            algorithm, value = value.split(':', 1)
+        algorithm = (algorithm or Brizo.CHECKSUM_ALGORITHMS.get(len(value), '')).lower()
+        algorithm = algorithm.replace('-', '')
+        if algorithm not in hashlib.algorithms_available:
+            logger.debug(f'Unknown checksum algorithm for {value}, it is not verified.')
+            return content_length, None
+
+        return content_length, (algorithm, value.lower())
+
+    @staticmethod
+    def _get_validator(response):
+        """
+        :return: the ETag, or else the Last-Modified date, of the content of `response` to use
+            in an `If-Range` header, None if there is none
+        """
+        etag = response.headers.get('etag')
+        # Weak ETags cannot be used in `If-Range`.
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('last-modified')
+
+    @staticmethod
+    def _read_validator(part_path):
+        try:
+            with open(f'{part_path}.validator') as f:
+                return f.read() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_validator(part_path, validator):
+        validator_path = f'{part_path}.validator'
+        if validator:
+            with open(validator_path, 'w') as f:
+                f.write(validator)
+        elif os.path.exists(validator_path):
+            os.remove(validator_path)
+
+    @staticmethod
+    def _remove_part(part_path):
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        Brizo._write_validator(part_path, None)
+
+    @staticmethod
+    def _accepts_ranges(response):
+        return response.headers.get('accept-ranges', '').lower() == 'bytes'
+
+    @staticmethod
+    def _get_expected_size(response):
+        """Total size of the file served by `response`, None if unknown."""
+        if response.headers.get('content-encoding'):
+            # The content is decoded while downloaded, its length does not match the headers.
+            return None
+        try:
+            if response.status_code == 206:
+                total = response.headers.get('content-range', '').rsplit('/', 1)[1]
+                return int(total)
+            return int(response.headers['content-length'])
+        except (KeyError, IndexError, ValueError):
+            return None
 
     @staticmethod
     def _create_consume_url(service_endpoint, service_agreement_id, account, _file=None,
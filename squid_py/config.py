@@ -16,6 +16,20 @@ DEFAULT_KEEPER_PATH = 'artifacts'
 DEFAULT_GAS_LIMIT = 4000000
 DEFAULT_NAME_AQUARIUS_URL = 'http://localhost:5000'
 DEFAULT_STORAGE_PATH = 'squid_py.db'
+DEFAULT_DID_INDEX_CAPACITY = 100000
+DEFAULT_DDO_CACHE_SIZE = 1000
+DEFAULT_DDO_CACHE_TTL = 300
+DEFAULT_SEARCH_CACHE_SIZE = 0
+DEFAULT_SEARCH_CACHE_TTL = 10
+DEFAULT_EVENTS_INDEX_ENABLED = False
+DEFAULT_EVENTS_INDEX_FROM_BLOCK = 0
+DEFAULT_TEMPLATE_CACHE_TTL = 60
+DEFAULT_AUTH_TOKEN_CACHE_SIZE = 10000
+DEFAULT_DID_OWNER_CACHE_SIZE = 1000
+DEFAULT_DID_OWNER_CACHE_TTL = 300
+DEFAULT_DOWNLOADS_MAX_WORKERS = 4
+DEFAULT_DOWNLOADS_MAX_BYTES_PER_SECOND = 0
+DEFAULT_DOWNLOADS_CHUNK_SIZE = 1024 * 1024
 
 NAME_KEEPER_URL = 'keeper.url'
 NAME_KEEPER_PATH = 'keeper.path'
@@ -24,6 +38,20 @@ NAME_AQUARIUS_URL = 'aquarius.url'
 NAME_STORAGE_PATH = 'storage.path'
 NAME_AUTH_TOKEN_MESSAGE = 'auth_token_message'
 NAME_AUTH_TOKEN_EXPIRATION = 'auth_token_expiration'
+NAME_DID_INDEX_CAPACITY = 'did_index.capacity'
+NAME_DDO_CACHE_SIZE = 'ddo_cache.size'
+NAME_DDO_CACHE_TTL = 'ddo_cache.ttl'
+NAME_SEARCH_CACHE_SIZE = 'search_cache.size'
+NAME_SEARCH_CACHE_TTL = 'search_cache.ttl'
+NAME_EVENTS_INDEX_ENABLED = 'events_index.enabled'
+NAME_EVENTS_INDEX_FROM_BLOCK = 'events_index.from_block'
+NAME_TEMPLATE_CACHE_TTL = 'template_cache.ttl'
+NAME_AUTH_TOKEN_CACHE_SIZE = 'auth_token_cache.size'
+NAME_DID_OWNER_CACHE_SIZE = 'did_owner_cache.size'
+NAME_DID_OWNER_CACHE_TTL = 'did_owner_cache.ttl'
+NAME_DOWNLOADS_MAX_WORKERS = 'downloads.max_workers'
+NAME_DOWNLOADS_MAX_BYTES_PER_SECOND = 'downloads.max_bytes_per_second'
+NAME_DOWNLOADS_CHUNK_SIZE = 'downloads.chunk_size'
 
 NAME_SECRET_STORE_URL = 'secret_store.url'
 NAME_PARITY_URL = 'parity.url'
@@ -60,7 +88,21 @@ config_defaults = {
         NAME_AQUARIUS_URL: DEFAULT_NAME_AQUARIUS_URL,
         NAME_STORAGE_PATH: DEFAULT_STORAGE_PATH,
         NAME_AUTH_TOKEN_MESSAGE: '',
-        NAME_AUTH_TOKEN_EXPIRATION: ''
+        NAME_AUTH_TOKEN_EXPIRATION: '',
+        NAME_DID_INDEX_CAPACITY: DEFAULT_DID_INDEX_CAPACITY,
+        NAME_DDO_CACHE_SIZE: DEFAULT_DDO_CACHE_SIZE,
+        NAME_DDO_CACHE_TTL: DEFAULT_DDO_CACHE_TTL,
+        NAME_SEARCH_CACHE_SIZE: DEFAULT_SEARCH_CACHE_SIZE,
+        NAME_SEARCH_CACHE_TTL: DEFAULT_SEARCH_CACHE_TTL,
+        NAME_EVENTS_INDEX_ENABLED: DEFAULT_EVENTS_INDEX_ENABLED,
+        NAME_EVENTS_INDEX_FROM_BLOCK: DEFAULT_EVENTS_INDEX_FROM_BLOCK,
+        NAME_TEMPLATE_CACHE_TTL: DEFAULT_TEMPLATE_CACHE_TTL,
+        NAME_AUTH_TOKEN_CACHE_SIZE: DEFAULT_AUTH_TOKEN_CACHE_SIZE,
+        NAME_DID_OWNER_CACHE_SIZE: DEFAULT_DID_OWNER_CACHE_SIZE,
+        NAME_DID_OWNER_CACHE_TTL: DEFAULT_DID_OWNER_CACHE_TTL,
+        NAME_DOWNLOADS_MAX_WORKERS: DEFAULT_DOWNLOADS_MAX_WORKERS,
+        NAME_DOWNLOADS_MAX_BYTES_PER_SECOND: DEFAULT_DOWNLOADS_MAX_BYTES_PER_SECOND,
+        NAME_DOWNLOADS_CHUNK_SIZE: DEFAULT_DOWNLOADS_CHUNK_SIZE
     }
 }
 
@@ -85,6 +127,37 @@ class Config(configparser.ConfigParser):
         aquarius.url = http://localhost:5000                          # Aquarius url.
         brizo.url = http://localhost:8030                             # Brizo url.
         storage.path = squid_py.db                                    # Path of sla back-up storage.
+        did_index.capacity = 100000                                   # Size of the known DIDs
+                                                                      # index, 0 to disable it.
+        ddo_cache.size = 1000                                         # Max number of cached DDOs,
+                                                                      # 0 to disable the cache.
+        ddo_cache.ttl = 300                                           # Cached DDOs ttl in seconds.
+        search_cache.size = 0                                         # Max number of cached search
+                                                                      # results, 0 disables the
+                                                                      # cache.
+        search_cache.ttl = 10                                         # Cached search results ttl in
+                                                                      # seconds.
+        events_index.enabled = false                                  # Index the keeper events in
+                                                                      # storage.path to answer the
+                                                                      # assets and providers
+                                                                      # lookups.
+        events_index.from_block = 0                                   # First block to index.
+        template_cache.ttl = 60                                       # Cached templates approval
+                                                                      # state ttl in seconds.
+        auth_token_cache.size = 10000                                 # Max number of verified auth
+                                                                      # tokens kept in cache, 0
+                                                                      # disables the cache.
+        did_owner_cache.size = 1000                                   # Max number of cached DID
+                                                                      # owners, 0 disables the
+                                                                      # cache.
+        did_owner_cache.ttl = 300                                     # Cached DID owners ttl in
+                                                                      # seconds.
+        downloads.max_workers = 4                                     # Max number of files of an
+                                                                      # asset downloaded at once.
+        downloads.max_bytes_per_second = 0                            # Limit of the total download
+                                                                      # rate, 0 for no limit.
+        downloads.chunk_size = 1048576                                # Bytes read from the network
+                                                                      # and written at once.
 
         :param filename: Path of the config file, str.
         :param options_dict: Python dict with the config, dict.
@@ -189,6 +262,76 @@ class Config(configparser.ConfigParser):
     def auth_token_expiration(self):
         return self.get('resources', NAME_AUTH_TOKEN_EXPIRATION)
 
+    @property
+    def did_index_capacity(self):
+        """Maximum number of DIDs in the local index of known DIDs, 0 disables the index."""
+        return int(self.get('resources', NAME_DID_INDEX_CAPACITY) or 0)
+
+    @property
+    def ddo_cache_size(self):
+        """Maximum number of resolved DDOs kept in cache, 0 disables the cache."""
+        return int(self.get('resources', NAME_DDO_CACHE_SIZE) or 0)
+
+    @property
+    def ddo_cache_ttl(self):
+        """Time to live of the cached DDOs in seconds."""
+        return float(self.get('resources', NAME_DDO_CACHE_TTL) or 0)
+
+    @property
+    def search_cache_size(self):
+        """Maximum number of aquarius search results kept in cache, 0 disables the cache."""
+        return int(self.get('resources', NAME_SEARCH_CACHE_SIZE) or 0)
+
+    @property
+    def search_cache_ttl(self):
+        """Time to live of the cached search results in seconds."""
+        return float(self.get('resources', NAME_SEARCH_CACHE_TTL) or 0)
+
+    @property
+    def events_index_enabled(self):
+        """Whether the keeper events are indexed locally, see `EventsIndexer`."""
+        return self.getboolean('resources', NAME_EVENTS_INDEX_ENABLED, fallback=False)
+
+    @property
+    def events_index_from_block(self):
+        """First block of the local index of the keeper events."""
+        return int(self.get('resources', NAME_EVENTS_INDEX_FROM_BLOCK) or 0)
+
+    @property
+    def template_cache_ttl(self):
+        """Time to live of the cached templates approval state in seconds."""
+        return float(self.get('resources', NAME_TEMPLATE_CACHE_TTL) or 0)
+
+    @property
+    def auth_token_cache_size(self):
+        """Maximum number of verified auth tokens kept in cache, 0 disables the cache."""
+        return int(self.get('resources', NAME_AUTH_TOKEN_CACHE_SIZE) or 0)
+
+    @property
+    def did_owner_cache_size(self):
+        """Maximum number of DID owners kept in cache, 0 disables the cache."""
+        return int(self.get('resources', NAME_DID_OWNER_CACHE_SIZE) or 0)
+
+    @property
+    def did_owner_cache_ttl(self):
+        """Time to live of the cached DID owners in seconds."""
+        return float(self.get('resources', NAME_DID_OWNER_CACHE_TTL) or 0)
+
+    @property
+    def downloads_max_workers(self):
+        """Maximum number of files of an asset downloaded concurrently."""
+        return int(self.get('resources', NAME_DOWNLOADS_MAX_WORKERS) or 1)
+
+    @property
+    def downloads_max_bytes_per_second(self):
+        """Limit of the total download rate in bytes per second, 0 for no limit."""
+        return int(self.get('resources', NAME_DOWNLOADS_MAX_BYTES_PER_SECOND) or 0)
+
+    @property
+    def downloads_chunk_size(self):
+        """Size in bytes of the chunks read from the network and written to the files."""
+        return int(self.get('resources', NAME_DOWNLOADS_CHUNK_SIZE) or DEFAULT_DOWNLOADS_CHUNK_SIZE)
+
     @property
     def web3_provider(self):
         """Web3 provider"""
@@ -0,0 +1,119 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import logging
+import time
+from collections import namedtuple
+
+from squid_py.data_store.storage_base import StorageBase
+
+logger = logging.getLogger(__name__)
+
+AgreementRecord = namedtuple(
+    'AgreementRecord',
+    ('agreement_id', 'did', 'service_type', 'consumer', 'publisher_address', 'condition_ids',
+     'auto_consume', 'status', 'block_number', 'updated_at')
+)
+
+
+class AgreementStates:
+    """States of the consumer side of a service agreement, in the order they are reached."""
+    CREATED = 'created'
+    REWARD_LOCKED = 'lockReward'
+    ACCESS_GRANTED = 'accessGranted'
+    CONSUMED = 'consumed'
+    REFUNDED = 'refunded'
+    EXPIRED = 'expired'
+
+
+class AgreementsStorage(StorageBase):
+    """
+    State of the agreements created by the consumers of this client.
+
+    Each agreement stores the last state it reached and the block of the event that moved it
+    there, so the processing of the agreements still in progress can be resumed from that
+    block after a restart.
+    """
+    AGREEMENTS_TABLE = 'service_agreements_states'
+
+    def __init__(self, storage_path):
+        StorageBase.__init__(self, storage_path)
+        with self._transaction() as conn:
+            conn.executescript(
+                f'''CREATE TABLE IF NOT EXISTS {self.AGREEMENTS_TABLE}
+                    (agreement_id VARCHAR PRIMARY KEY, did VARCHAR, service_type VARCHAR,
+                     consumer VARCHAR, publisher_address VARCHAR, condition_ids VARCHAR,
+                     auto_consume INTEGER, status VARCHAR, block_number INTEGER,
+                     updated_at REAL);
+                CREATE INDEX IF NOT EXISTS {self.AGREEMENTS_TABLE}_consumer
+                    ON {self.AGREEMENTS_TABLE} (consumer, status);'''
+            )
+
+    def record_agreement(self, agreement_id, did, service_type, consumer, publisher_address,
+                         condition_ids, auto_consume, block_number):
+        """
+        Store a new agreement in the `AgreementStates.CREATED` state.
+
+        :param agreement_id: id of the agreement, hex str
+        :param did: DID, str
+        :param service_type: str type of the agreement service
+        :param consumer: hex str ethereum address of the consumer
+        :param publisher_address: hex str ethereum address of the publisher
+        :param condition_ids: list of the condition ids, hex str
+        :param auto_consume: bool
+        :param block_number: int block from which the agreement events are processed
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.AGREEMENTS_TABLE} VALUES (?,?,?,?,?,?,?,?,?,?);',
+                (agreement_id, did, service_type, consumer.lower(), publisher_address,
+                 json.dumps(list(condition_ids)), int(bool(auto_consume)),
+                 AgreementStates.CREATED, block_number, time.time())
+            )
+
+    def update_status(self, agreement_id, status, block_number=None):
+        """
+        :param agreement_id: id of the agreement, hex str
+        :param status: str one of `AgreementStates`
+        :param block_number: int block of the event that changed the state, None to keep the
+            current block
+        """
+        logger.debug(f'Agreement {agreement_id} state changed to {status}.')
+        with self._transaction() as conn:
+            conn.execute(
+                f'''UPDATE {self.AGREEMENTS_TABLE}
+                    SET status=?, block_number=COALESCE(?, block_number), updated_at=?
+                    WHERE agreement_id=?;''',
+                (status, block_number, time.time(), agreement_id)
+            )
+
+    def get_agreement(self, agreement_id):
+        """
+        :param agreement_id: id of the agreement, hex str
+        :return: AgreementRecord, None if the agreement is not stored
+        """
+        records = self._select(
+            f'SELECT * FROM {self.AGREEMENTS_TABLE} WHERE agreement_id=?;', (agreement_id,))
+        return records[0] if records else None
+
+    def get_pending_agreements(self, consumer):
+        """
+        Agreements of `consumer` whose processing is not finished: the reward is not locked
+        yet or, for the auto consumed agreements, the asset is not consumed or refunded yet.
+
+        :param consumer: hex str ethereum address of the consumer
+        :return: list of AgreementRecord, ordered by block number
+        """
+        return self._select(
+            f'''SELECT * FROM {self.AGREEMENTS_TABLE}
+                WHERE consumer=? AND (status=? OR (auto_consume=1 AND status IN (?,?)))
+                ORDER BY block_number;''',
+            (consumer.lower(), AgreementStates.CREATED, AgreementStates.REWARD_LOCKED,
+             AgreementStates.ACCESS_GRANTED)
+        )
+
+    def _select(self, query, args):
+        return [
+            AgreementRecord(*row[:5], json.loads(row[5]), bool(row[6]), *row[7:])
+            for row in self._run_query(query, args)
+        ]
@@ -2,13 +2,26 @@
 #  SPDX-License-Identifier: Apache-2.0
 import logging
 
-from ocean_utils.data_store.storage_base import StorageBase
+from squid_py.data_store.storage_base import StorageBase
 
 logger = logging.getLogger(__name__)
 
 
 class AuthTokensStorage(StorageBase):
+    """
+    Signed auth tokens of the accounts, one per address.
+    """
     AUTH_TOKENS_TABLE = 'auth_tokens'
+    # Maximum number of addresses in one `read_tokens_many` query, below the sqlite limit of
+    # 999 query parameters.
+    MAX_READ_BATCH_SIZE = 500
+
+    def __init__(self, storage_path):
+        StorageBase.__init__(self, storage_path)
+        self._run_query(
+            f'''CREATE TABLE IF NOT EXISTS {self.AUTH_TOKENS_TABLE}
+               (address VARCHAR PRIMARY KEY, signed_token VARCHAR, created VARCHAR);'''
+        )
 
     def write_token(self, address, signed_token, created_at):
         """
@@ -21,14 +34,25 @@ class AuthTokensStorage(StorageBase):
         logger.debug(f'Writing token to `auth_tokens` storage: '
                      f'account={address}, token={signed_token}')
         self._run_query(
-            f'''CREATE TABLE IF NOT EXISTS {self.AUTH_TOKENS_TABLE}
-               (address VARCHAR PRIMARY KEY, signed_token VARCHAR, created VARCHAR);'''
+            f'''INSERT OR REPLACE
+                INTO {self.AUTH_TOKENS_TABLE}
+                VALUES (?,?,?)''',
+            [address, signed_token, created_at],
         )
+
+    def write_tokens_many(self, tokens):
+        """
+        Store the signed tokens of several accounts in one transaction.
+
+        :param tokens: list of (address, signed_token, created_at) tuples, see `write_token`
+        """
+        logger.debug(f'Writing {len(tokens)} tokens to `auth_tokens` storage.')
         self._run_query(
             f'''INSERT OR REPLACE
                 INTO {self.AUTH_TOKENS_TABLE}
                 VALUES (?,?,?)''',
-            [address, signed_token, created_at],
+            [tuple(token) for token in tokens],
+            many=True
         )
 
     def update_token(self, address, signed_token, created_at):
@@ -56,12 +80,11 @@ class AuthTokensStorage(StorageBase):
         :return: tuple (signed_token, created_at)
         """
         try:
-            rows = [row for row in self._run_query(
+            rows = self._run_query(
                 f'''SELECT signed_token, created
                     FROM {self.AUTH_TOKENS_TABLE}
                     WHERE address=?;''',
                 (address,))
-                    ]
             token, timestamp = rows[0] if rows else (None, None)
             logger.debug(f'Read auth token from `auth_tokens` storage: '
                          f'account={address}, token={token}')
@@ -70,3 +93,24 @@ class AuthTokensStorage(StorageBase):
         except Exception as e:
             logging.error(f'Error reading token: {e}')
             return None, None
+
+    def read_tokens_many(self, addresses):
+        """
+        Retrieve the stored signed tokens of several ethereum addresses
+
+        :param addresses: list of hex str ethereum addresses
+        :return: dict address -> tuple (signed_token, created_at), the addresses without a
+            stored token are not included
+        """
+        addresses = list(addresses)
+        tokens = {}
+        for i in range(0, len(addresses), self.MAX_READ_BATCH_SIZE):
+            batch = addresses[i:i + self.MAX_READ_BATCH_SIZE]
+            rows = self._run_query(
+                f'''SELECT address, signed_token, created
+                    FROM {self.AUTH_TOKENS_TABLE}
+                    WHERE address IN ({','.join('?' * len(batch))});''',
+                batch)
+            tokens.update({address: (token, created) for address, token, created in rows})
+        return tokens
+
@@ -0,0 +1,133 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import logging
+
+from squid_py.data_store.storage_base import StorageBase
+
+logger = logging.getLogger(__name__)
+
+
+class EventsIndexStorage(StorageBase):
+    """
+    Tables of the local index of the keeper events, kept up to date by `EventsIndexer`.
+
+    DIDs and agreement ids are stored as returned by `to_index_key`, addresses are stored
+    lowercase except the providers which are kept as returned by the keeper.
+    """
+    CHECKPOINTS_TABLE = 'events_index_checkpoints'
+    DIDS_TABLE = 'events_index_dids'
+    PROVIDERS_TABLE = 'events_index_providers'
+    PERMISSIONS_TABLE = 'events_index_permissions'
+    PURCHASES_TABLE = 'events_index_purchases'
+
+    def __init__(self, storage_path):
+        StorageBase.__init__(self, storage_path)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._transaction() as conn:
+            conn.executescript(
+                f'''CREATE TABLE IF NOT EXISTS {self.CHECKPOINTS_TABLE}
+                    (name VARCHAR PRIMARY KEY, block_number INTEGER);
+                CREATE TABLE IF NOT EXISTS {self.DIDS_TABLE}
+                    (did VARCHAR PRIMARY KEY, owner VARCHAR, block_number INTEGER);
+                CREATE INDEX IF NOT EXISTS {self.DIDS_TABLE}_owner
+                    ON {self.DIDS_TABLE} (owner);
+                CREATE TABLE IF NOT EXISTS {self.PROVIDERS_TABLE}
+                    (did VARCHAR, provider VARCHAR, PRIMARY KEY (did, provider));
+                CREATE TABLE IF NOT EXISTS {self.PERMISSIONS_TABLE}
+                    (did VARCHAR, grantee VARCHAR, PRIMARY KEY (did, grantee));
+                CREATE TABLE IF NOT EXISTS {self.PURCHASES_TABLE}
+                    (agreement_id VARCHAR PRIMARY KEY, did VARCHAR, consumer VARCHAR,
+                     block_number INTEGER);
+                CREATE INDEX IF NOT EXISTS {self.PURCHASES_TABLE}_consumer
+                    ON {self.PURCHASES_TABLE} (consumer, block_number);'''
+            )
+
+    def get_checkpoint(self, name):
+        """
+        :param name: str name of the checkpoint
+        :return: int number of the last indexed block, None if nothing was indexed yet
+        """
+        rows = self._run_query(
+            f'SELECT block_number FROM {self.CHECKPOINTS_TABLE} WHERE name=?;', (name,))
+        return rows[0][0] if rows else None
+
+    def write_events(self, checkpoint_name, block_number, registrations=(), providers=None,
+                     permissions=(), purchases=()):
+        """
+        Store the changes found in a range of blocks and move the checkpoint to the end of
+        that range, all in one transaction.
+
+        :param checkpoint_name: str name of the checkpoint
+        :param block_number: int number of the last block of the indexed range
+        :param registrations: list of (did, owner, block_number) tuples
+        :param providers: dict did -> list of the current providers of the did
+        :param permissions: list of (did, grantee, granted) tuples, in the order of the events
+        :param purchases: list of (agreement_id, did, consumer, block_number) tuples
+        """
+        with self._transaction() as conn:
+            conn.executemany(
+                f'INSERT OR REPLACE INTO {self.DIDS_TABLE} VALUES (?,?,?);', registrations)
+            for did, did_providers in (providers or {}).items():
+                conn.execute(f'DELETE FROM {self.PROVIDERS_TABLE} WHERE did=?;', (did,))
+                conn.executemany(
+                    f'INSERT OR IGNORE INTO {self.PROVIDERS_TABLE} VALUES (?,?);',
+                    [(did, provider) for provider in did_providers])
+            for did, grantee, granted in permissions:
+                if granted:
+                    conn.execute(
+                        f'INSERT OR IGNORE INTO {self.PERMISSIONS_TABLE} VALUES (?,?);',
+                        (did, grantee))
+                else:
+                    conn.execute(
+                        f'DELETE FROM {self.PERMISSIONS_TABLE} WHERE did=? AND grantee=?;',
+                        (did, grantee))
+            conn.executemany(
+                f'INSERT OR REPLACE INTO {self.PURCHASES_TABLE} VALUES (?,?,?,?);', purchases)
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.CHECKPOINTS_TABLE} VALUES (?,?);',
+                (checkpoint_name, block_number))
+
+        logger.debug(f'Indexed events up to block {block_number}: '
+                     f'{len(registrations)} registrations, {len(permissions)} permission changes, '
+                     f'{len(purchases)} purchases.')
+
+    def get_owner_dids(self, owner):
+        """
+        :param owner: hex str ethereum address
+        :return: list of the keys of the dids registered by `owner`, ordered by block number
+        """
+        return [row[0] for row in self._run_query(
+            f'SELECT did FROM {self.DIDS_TABLE} WHERE owner=? ORDER BY block_number;',
+            (owner.lower(),))]
+
+    def get_consumer_dids(self, consumer):
+        """
+        :param consumer: hex str ethereum address
+        :return: list of the keys of the dids for which access was granted to `consumer`,
+            ordered by block number
+        """
+        return [row[0] for row in self._run_query(
+            f'SELECT did FROM {self.PURCHASES_TABLE} WHERE consumer=? ORDER BY block_number;',
+            (consumer.lower(),))]
+
+    def get_providers(self, did):
+        """
+        :param did: key of the did, see `to_index_key`
+        :return: list of the providers of `did`, None if `did` is not indexed
+        """
+        if not self._run_query(f'SELECT 1 FROM {self.DIDS_TABLE} WHERE did=?;', (did,)):
+            return None
+        return [row[0] for row in self._run_query(
+            f'SELECT provider FROM {self.PROVIDERS_TABLE} WHERE did=?;', (did,))]
+
+    def has_permission(self, did, grantee):
+        """
+        :param did: key of the did, see `to_index_key`
+        :param grantee: hex str ethereum address
+        :return: bool
+        """
+        return bool(self._run_query(
+            f'SELECT 1 FROM {self.PERMISSIONS_TABLE} WHERE did=? AND grantee=?;',
+            (did, grantee.lower())))
@@ -0,0 +1,63 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from ocean_utils.data_store.storage_base import StorageBase as _StorageBase
+
+
+class StorageBase(_StorageBase):
+    """
+    Connection management of the storages, which share the `storage.path` database and are
+    used from several threads.
+
+    Each thread reuses its own connection to the database, opened in WAL mode so the readers
+    do not wait for the writers. An in memory database has a single connection shared by
+    all the threads and guarded by `_lock`.
+    """
+
+    def __init__(self, storage_path):
+        _StorageBase.__init__(self, storage_path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if self._storage_path == ':memory:':
+            self._conn = sqlite3.connect(self._storage_path, check_same_thread=False)
+
+    def _get_connection(self):
+        if self._storage_path == ':memory:':
+            return self._conn
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._storage_path)
+            conn.execute('PRAGMA journal_mode=WAL;')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Connection of the current thread, the statements executed with it are committed at
+        the exit of the context, or rolled back if it raises.
+        """
+        conn = self._get_connection()
+        if conn is self._conn:
+            with self._lock, conn:
+                yield conn
+        else:
+            with conn:
+                yield conn
+
+    def _run_query(self, query, args=None, many=False):
+        """
+        :param query: str the sql query to execute in sqlite3.
+        :param args: tuple/list of arguments that go along with the query, or a list of them
+            if `many` is True
+        :param many: bool execute the query once for each item of `args`, in one transaction
+        :return: list of the rows resulting from the query.
+        """
+        with self._transaction() as conn:
+            if many:
+                return conn.executemany(query, args).fetchall()
+            return conn.execute(query, args or ()).fetchall()
@@ -0,0 +1,5 @@
+"""DID Resolver module."""
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from .cached_did_resolver import CachedDIDResolver
@@ -0,0 +1,174 @@
+"""DID Resolver module."""
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ocean_keeper.exceptions import OceanDIDNotFound
+from ocean_utils.aquarius.aquarius_provider import AquariusProvider
+from ocean_utils.ddo.ddo import DDO
+from ocean_utils.did import did_to_id_bytes, id_to_did
+from ocean_utils.did_resolver.did_resolver import DIDResolver
+
+from squid_py.events.event_dispatcher import EventDispatcher
+from squid_py.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger('keeper')
+
+
+class CachedDIDResolver(DIDResolver):
+    """
+    DID Resolver keeping the resolved DDOs in a bounded LRU cache.
+
+    Cached DDOs expire after `ttl` seconds and are invalidated as soon as a
+    `DIDAttributeRegistered` event is emitted for their DID. The cache holds the DDOs as
+    dictionaries and every caller gets its own DDO instance, which it is free to modify.
+    """
+
+    def __init__(self, did_registry, max_size=1000, ttl=300, event_dispatcher=None):
+        """
+        :param did_registry: DIDRegistry contract instance
+        :param max_size: int maximum number of cached DDOs, 0 disables the cache
+        :param ttl: float time to live of the cached DDOs in seconds
+        :param event_dispatcher: EventDispatcher watching the DIDRegistry events, shared with
+            the other users of the keeper events
+        """
+        DIDResolver.__init__(self, did_registry)
+        self._cache = TTLCache(max_size, ttl)
+        self._event_dispatcher = None
+        if max_size:
+            # The registry events are watched before any DDO is cached.
+            self._event_dispatcher = event_dispatcher or EventDispatcher()
+            self._event_dispatcher.watch(
+                did_registry, did_registry.DID_REGISTRY_EVENT_NAME, self._on_did_registered)
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+    def cache_stats(self):
+        """
+        :return: dict with the `hits`, `misses` and current `size` of the DDO cache
+        """
+        return self._cache.stats()
+
+    def resolve(self, did):
+        """
+        Resolve a DID to a DDO, see `DIDResolver.resolve`.
+
+        :param did: 32 byte value or DID string to resolve
+        :return: DDO instance
+        """
+        did_bytes = did_to_id_bytes(did)
+        ddo_dict = self._cache.get(did_bytes)
+        if ddo_dict is not None:
+            return DDO(dictionary=ddo_dict)
+
+        version = self._cache.version
+        ddo = DIDResolver.resolve(self, did)
+        if ddo:
+            self._cache.set(did_bytes, ddo.as_dictionary(), version)
+        return ddo
+
+    def resolve_many(self, dids, max_workers=10):
+        """
+        Resolve a batch of DIDs.
+
+        The registered urls of the DIDs missing from the cache are looked up concurrently, then
+        their DDOs are fetched concurrently reusing one Aquarius connection pool per url.
+
+        :param dids: list of 32 byte values or DID strings
+        :param max_workers: int maximum number of concurrent requests
+        :return: list of tuples (ddo, error) in the same order as `dids`. `ddo` is None and
+            `error` is the raised exception if resolving that DID failed.
+        """
+        results = [None] * len(dids)
+        did_bytes_to_indices = {}
+        for i, did in enumerate(dids):
+            try:
+                did_bytes = did_to_id_bytes(did)
+            except (TypeError, ValueError) as e:
+                results[i] = (None, e)
+                continue
+
+            ddo_dict = self._cache.get(did_bytes)
+            if ddo_dict is not None:
+                results[i] = (DDO(dictionary=ddo_dict), None)
+            else:
+                did_bytes_to_indices.setdefault(did_bytes, []).append(i)
+
+        if not did_bytes_to_indices:
+            return results
+
+        def _set_result(_did_bytes, ddo, error):
+            for n, index in enumerate(did_bytes_to_indices[_did_bytes]):
+                # A DID repeated in `dids` gets a DDO instance per occurrence.
+                results[index] = (DDO(dictionary=ddo.as_dictionary()) if ddo and n else ddo,
+                                  error)
+
+        version = self._cache.version
+        url_to_aquarius = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            url_futures = {executor.submit(self.get_resolve_url, did_bytes): did_bytes
+                           for did_bytes in did_bytes_to_indices}
+            ddo_futures = {}
+            for future in as_completed(url_futures):
+                did_bytes = url_futures[future]
+                try:
+                    url = future.result()
+                    if not url:
+                        raise OceanDIDNotFound(f'DID {id_to_did(did_bytes)} has no registered url.')
+                except Exception as e:
+                    _set_result(did_bytes, None, e)
+                    continue
+
+                if url not in url_to_aquarius:
+                    url_to_aquarius[url] = AquariusProvider.get_aquarius(url)
+                ddo_futures[executor.submit(
+                    url_to_aquarius[url].get_asset_ddo, id_to_did(did_bytes))] = did_bytes
+
+            for future in as_completed(ddo_futures):
+                did_bytes = ddo_futures[future]
+                try:
+                    ddo = future.result()
+                    if not ddo:
+                        raise OceanDIDNotFound(
+                            f'DDO of DID {id_to_did(did_bytes)} is not found in Aquarius.')
+                except Exception as e:
+                    _set_result(did_bytes, None, e)
+                    continue
+
+                self._cache.set(did_bytes, ddo.as_dictionary(), version)
+                _set_result(did_bytes, ddo, None)
+
+        return results
+
+    def invalidate(self, did):
+        """
+        Drop the cached DDO of `did`.
+
+        :param did: 32 byte value or DID string
+        """
+        self._cache.pop(did_to_id_bytes(did))
+
+    def clear(self):
+        """Drop all cached DDOs."""
+        self._cache.clear()
+
+    def stop(self):
+        """Stop watching the DIDRegistry events."""
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.unwatch(
+                self._did_registry, self._did_registry.DID_REGISTRY_EVENT_NAME,
+                self._on_did_registered)
+            self._event_dispatcher = None
+
+    def _on_did_registered(self, event):
+        did_bytes = event.args['_did']
+        logger.debug(f'invalidate cached ddo of did {did_bytes.hex()}')
+        self._cache.pop(did_bytes)
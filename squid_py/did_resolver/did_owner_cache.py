@@ -0,0 +1,108 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import logging
+
+from squid_py.events.event_dispatcher import EventDispatcher
+from squid_py.utils.batch_call import BatchCall
+from squid_py.utils.keys import to_index_key
+from squid_py.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger('keeper')
+
+
+class DIDOwnerCache:
+    """
+    Owners of the DIDs read from the DIDRegistry, kept in a bounded LRU cache.
+
+    Cached owners expire after `ttl` seconds and are invalidated as soon as a
+    `DIDOwnershipTransferred` event is emitted for their DID, or when the ownership is
+    transferred through `invalidate`.
+    """
+    OWNERSHIP_TRANSFERRED_EVENT = 'DIDOwnershipTransferred'
+
+    def __init__(self, did_registry, max_size=1000, ttl=300, event_dispatcher=None):
+        """
+        :param did_registry: DIDRegistry contract instance
+        :param max_size: int maximum number of cached owners, 0 disables the cache
+        :param ttl: float time to live of the cached owners in seconds
+        :param event_dispatcher: EventDispatcher watching the DIDRegistry events, shared with
+            the other users of the keeper events
+        """
+        self._did_registry = did_registry
+        self._cache = TTLCache(max_size, ttl)
+        self._event_dispatcher = None
+        if max_size:
+            # The transfers are watched before any owner is cached.
+            self._event_dispatcher = event_dispatcher or EventDispatcher()
+            self._event_dispatcher.watch(
+                did_registry, self.OWNERSHIP_TRANSFERRED_EVENT, self._on_ownership_transferred)
+
+    def cache_stats(self):
+        """
+        :return: dict with the `hits`, `misses` and current `size` of the owners cache
+        """
+        return self._cache.stats()
+
+    def get_owner(self, did):
+        """
+        :param did: DID, asset id hex str or bytes
+        :return: ethereum address of the owner of `did`, hex str
+        """
+        key = to_index_key(did)
+        owner = self._cache.get(key)
+        if owner is not None:
+            return owner
+
+        version = self._cache.version
+        owner = self._did_registry.get_did_owner(key)
+        self._cache_owner(key, owner, version)
+        return owner
+
+    def get_owners(self, dids):
+        """
+        Owners of a batch of DIDs, the ones missing from the cache are read in JSON-RPC batch
+        requests.
+
+        :param dids: list of DID, asset id hex str or bytes
+        :return: list of the ethereum addresses of the owners in the same order as `dids`
+        """
+        keys = [to_index_key(did) for did in dids]
+        owners = {key: self._cache.get(key) for key in set(keys)}
+        missing = [key for key, owner in owners.items() if owner is None]
+        if missing:
+            version = self._cache.version
+            batch = BatchCall()
+            for key in missing:
+                batch.add(self._did_registry, 'getDIDOwner', key)
+            for key, owner in zip(missing, batch.execute()):
+                owners[key] = owner
+                self._cache_owner(key, owner, version)
+
+        return [owners[key] for key in keys]
+
+    def invalidate(self, did):
+        """
+        Drop the cached owner of `did`, to call when its ownership is transferred.
+
+        :param did: DID, asset id hex str or bytes
+        """
+        self._cache.pop(to_index_key(did))
+
+    def stop(self):
+        """Stop watching the ownership transfers."""
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.unwatch(
+                self._did_registry, self.OWNERSHIP_TRANSFERRED_EVENT,
+                self._on_ownership_transferred)
+            self._event_dispatcher = None
+
+    def _cache_owner(self, key, owner, version):
+        # Unregistered DIDs have no owner yet, they are not cached.
+        if owner and int(owner, 16) != 0:
+            self._cache.set(key, owner, version)
+
+    def _on_ownership_transferred(self, event):
+        key = to_index_key(event.args['_did'])
+        logger.debug(f'invalidate cached owner of did {key}')
+        self._cache.pop(key)
@@ -0,0 +1,5 @@
+"""Events module."""
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from .event_dispatcher import EventDispatcher
@@ -0,0 +1,360 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ocean_keeper.event_filter import EventFilter
+from ocean_keeper.web3_provider import Web3Provider
+
+from squid_py.events.utils import get_event_logs
+from squid_py.utils.keys import to_index_key
+from squid_py.utils.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+
+class _Subscription:
+    __slots__ = ('key', 'agreement_id', 'callback', 'timeout_callback', 'args', 'done')
+
+    def __init__(self, key, agreement_id, callback, timeout_callback, args):
+        self.key = key
+        self.agreement_id = agreement_id
+        self.callback = callback
+        self.timeout_callback = timeout_callback
+        self.args = args
+        self.done = False
+
+
+class EventDispatcher:
+    """
+    Route the logs of agreement events to the handlers subscribed for each agreement id, and
+    the logs of watched events to their watchers.
+
+    A single thread serves all the subscriptions: every contract event with pending
+    subscriptions or watchers has one log filter, polled once per new block, and its logs are
+    dispatched by `_agreementId`. Subscription timeouts are tracked in a timer wheel. The
+    callbacks, and the block listeners notified of each new block, run on a thread pool so a
+    slow handler does not delay the other agreements. The filters are created and uninstalled
+    outside of the lock guarding the subscriptions, so a slow node only delays the callers
+    waiting for that filter.
+
+    Callbacks are called the same way as with `ContractBase.subscribe_to_event`: with the
+    event and `args` once the event is received, or on timeout with `args` only if a
+    `timeout_callback` is given, otherwise the callback gets None instead of the event.
+    """
+    POLL_INTERVAL = 0.5  # seconds
+    AGREEMENT_ID_ARGUMENT = '_agreementId'
+
+    def __init__(self, poll_interval=None, max_workers=10):
+        """
+        :param poll_interval: float seconds between two checks for a new block
+        :param max_workers: int maximum number of callbacks running concurrently
+        """
+        self._poll_interval = poll_interval or self.POLL_INTERVAL
+        self._callbacks_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._timers = TimerWheel()
+        self._lock = threading.Lock()
+        self._filters = {}
+        self._subscriptions = {}
+        self._watchers = {}
+        self._block_listeners = []
+        self._catch_ups = []
+        self._last_block = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def num_subscriptions(self):
+        """Number of subscriptions waiting for their event."""
+        with self._lock:
+            return sum(len(subscriptions) for by_agreement in self._subscriptions.values()
+                       for subscriptions in by_agreement.values())
+
+    def subscribe(self, contract, event_name, agreement_id, timeout, callback, args=(),
+                  timeout_callback=None, from_block=None):
+        """
+        Call `callback` with the first `event_name` log emitted for `agreement_id`.
+
+        :param contract: ContractBase instance emitting the event
+        :param event_name: str name of an event with an indexed `_agreementId` argument
+        :param agreement_id: id of the agreement, hex str
+        :param timeout: float seconds to wait for the event
+        :param callback: function called with the event and `args`
+        :param args: tuple of extra arguments of the callbacks
+        :param timeout_callback: function called with `args` if the event is not received
+            before `timeout`
+        :param from_block: int first block to look for the event, None for the next blocks
+        :return: the subscription, to pass to `unsubscribe`
+        """
+        key = (contract.address, event_name)
+        subscription = _Subscription(
+            key, to_index_key(agreement_id), callback, timeout_callback, args or ())
+        with self._lock:
+            future, create = self._reserve_filter(key)
+            self._subscriptions.setdefault(key, {}).setdefault(
+                subscription.agreement_id, []).append(subscription)
+        try:
+            self._install_filter(contract, event_name, future, create)
+        except Exception:
+            self._cancel(subscription)
+            raise
+
+        if from_block is not None and from_block != 'latest':
+            # Logs emitted before the filter was created are fetched once for this
+            # agreement only.
+            with self._lock:
+                self._catch_ups.append((contract, event_name, agreement_id, from_block))
+
+        self._expire(self._timers.advance())
+        self._timers.schedule(timeout, subscription)
+        self._start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Drop a subscription returned by `subscribe` before it is done, its callbacks are not
+        called.
+        """
+        self._cancel(subscription)
+
+    def watch(self, contract, event_name, callback):
+        """
+        Call `callback` with every `event_name` log emitted from now on, until `unwatch`.
+
+        The log filter is installed before returning, so no log emitted after this call is
+        missed.
+
+        :param contract: ContractBase instance emitting the event
+        :param event_name: str name of the event
+        :param callback: function taking the event log as its only argument
+        """
+        with self._lock:
+            future, create = self._reserve_filter((contract.address, event_name))
+            self._watchers.setdefault((contract.address, event_name), []).append(callback)
+        try:
+            self._install_filter(contract, event_name, future, create)
+        except Exception:
+            self.unwatch(contract, event_name, callback)
+            raise
+
+        self._start()
+
+    def unwatch(self, contract, event_name, callback):
+        """
+        Stop calling `callback` with the `event_name` logs, see `watch`.
+        """
+        key = (contract.address, event_name)
+        with self._lock:
+            watchers = self._watchers.get(key, [])
+            if callback in watchers:
+                watchers.remove(callback)
+            unused_filter = self._remove_filter_if_unused(key)
+        self._uninstall_filter(key, unused_filter)
+
+    def add_block_listener(self, callback):
+        """
+        Call `callback` with the number of every new block.
+
+        :param callback: function taking the block number as its only argument
+        """
+        with self._lock:
+            self._block_listeners.append(callback)
+        self._start()
+
+    def remove_block_listener(self, callback):
+        with self._lock:
+            if callback in self._block_listeners:
+                self._block_listeners.remove(callback)
+
+    def stop(self):
+        """Stop dispatching events, pending subscriptions are dropped."""
+        self._stopped.set()
+
+    def _reserve_filter(self, key):
+        """
+        Called with `_lock` held.
+
+        :return: tuple (Future of the EventFilter of `key`, True if the caller creates it)
+        """
+        future = self._filters.get(key)
+        if future is not None:
+            return future, False
+
+        future = self._filters[key] = Future()
+        return future, True
+
+    def _install_filter(self, contract, event_name, future, create):
+        """Create the filter reserved by `_reserve_filter`, or wait for its creation."""
+        if not create:
+            future.result()
+            return
+
+        key = (contract.address, event_name)
+        try:
+            event_filter = EventFilter(
+                event_name,
+                getattr(contract.events, event_name),
+                None,
+                from_block='latest',
+                to_block='latest'
+            )
+        except Exception as e:
+            with self._lock:
+                future.set_exception(e)
+                if self._filters.get(key) is future:
+                    self._filters.pop(key)
+            raise
+
+        with self._lock:
+            future.set_result(event_filter)
+            # The subscriptions may all be gone already, see `_remove_filter_if_unused`.
+            removed = self._filters.get(key) is not future
+        if removed:
+            self._uninstall_filter(key, future)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self._poll_interval):
+            self._expire(self._timers.advance())
+            try:
+                self._catch_up()
+                self._poll()
+            except Exception as e:
+                # ignore error, but log it
+                logger.debug(f'Got error grabbing keeper events: {str(e)}')
+
+    def _catch_up(self):
+        with self._lock:
+            catch_ups, self._catch_ups = self._catch_ups, []
+
+        for i, (contract, event_name, agreement_id, from_block) in enumerate(catch_ups):
+            try:
+                logs = get_event_logs(
+                    contract, event_name, from_block, 'latest',
+                    {self.AGREEMENT_ID_ARGUMENT: Web3Provider.get_web3().toBytes(
+                        hexstr=agreement_id)}
+                )
+            except Exception:
+                with self._lock:
+                    self._catch_ups.extend(catch_ups[i:])
+                raise
+
+            for log in logs:
+                self._dispatch((contract.address, event_name), log, notify_watchers=False)
+
+    def _poll(self):
+        block_number = Web3Provider.get_web3().eth.blockNumber
+        if block_number == self._last_block:
+            return
+
+        with self._lock:
+            filters = [(key, future.result()) for key, future in self._filters.items()
+                       if future.done() and not future.exception()]
+            block_listeners = list(self._block_listeners)
+        for key, event_filter in filters:
+            try:
+                logs = event_filter.get_new_entries()
+            except Exception as e:
+                # ignore error, but log it
+                logger.debug(f'Got error grabbing {key[1]} events: {str(e)}')
+                continue
+
+            for log in logs:
+                self._dispatch(key, log)
+        self._last_block = block_number
+
+        for block_listener in block_listeners:
+            self._run_callback(block_listener, block_number)
+
+    def _dispatch(self, key, log, notify_watchers=True):
+        with self._lock:
+            watchers = list(self._watchers.get(key, ())) if notify_watchers else []
+            subscriptions = []
+            if self._subscriptions.get(key):
+                agreement_id = to_index_key(log.args[self.AGREEMENT_ID_ARGUMENT])
+                subscriptions = self._subscriptions[key].pop(agreement_id, [])
+            for subscription in subscriptions:
+                subscription.done = True
+            unused_filter = self._remove_filter_if_unused(key)
+        self._uninstall_filter(key, unused_filter)
+
+        for watcher in watchers:
+            self._run_callback(watcher, log)
+        for subscription in subscriptions:
+            if subscription.callback:
+                self._run_callback(subscription.callback, log, *subscription.args)
+
+    def _expire(self, subscriptions):
+        for subscription in subscriptions:
+            if not self._cancel(subscription):
+                continue
+
+            if subscription.timeout_callback is not None:
+                self._run_callback(subscription.timeout_callback, *subscription.args)
+            elif subscription.callback is not None:
+                self._run_callback(subscription.callback, None, *subscription.args)
+
+    def _cancel(self, subscription):
+        """
+        Remove `subscription` without calling its callbacks.
+
+        :return: bool False if the subscription was already done
+        """
+        with self._lock:
+            if subscription.done:
+                return False
+
+            subscription.done = True
+            by_agreement = self._subscriptions.get(subscription.key, {})
+            pending = by_agreement.get(subscription.agreement_id, [])
+            if subscription in pending:
+                pending.remove(subscription)
+            if not pending:
+                by_agreement.pop(subscription.agreement_id, None)
+            unused_filter = self._remove_filter_if_unused(subscription.key)
+        self._uninstall_filter(subscription.key, unused_filter)
+        return True
+
+    def _remove_filter_if_unused(self, key):
+        """
+        Called with `_lock` held, the filter is uninstalled with `_uninstall_filter` once the
+        lock is released.
+
+        :return: Future of the removed filter if it is created already, None otherwise
+        """
+        if self._subscriptions.get(key) or self._watchers.get(key):
+            return None
+
+        self._subscriptions.pop(key, None)
+        self._watchers.pop(key, None)
+        future = self._filters.pop(key, None)
+        # A filter still being created is uninstalled by `_install_filter`.
+        return future if future is not None and future.done() else None
+
+    @staticmethod
+    def _uninstall_filter(key, future):
+        if future is None or future.exception():
+            return
+
+        try:
+            future.result().uninstall()
+        except Exception as e:
+            logger.debug(f'Could not uninstall {key[1]} filter: {e}')
+
+    def _run_callback(self, callback, *args):
+        def _call():
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f'Error in event callback {callback}: {str(e)}', exc_info=1)
+
+        self._callbacks_executor.submit(_call)
@@ -0,0 +1,145 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import logging
+import threading
+
+from ocean_keeper.web3_provider import Web3Provider
+
+from squid_py.events.utils import get_event_logs
+from squid_py.utils.keys import to_index_key
+
+logger = logging.getLogger(__name__)
+
+
+class EventsIndexer:
+    """
+    Incremental local index of the DIDRegistry and AccessSecretStoreCondition events.
+
+    The events are synced by ranges of `block_range` blocks starting after the last indexed
+    block, each range is stored together with its checkpoint so an interrupted sync resumes
+    where it stopped.
+
+    Once started, the index is synced in the background after every new block, so the
+    queries of the index can lag one block behind the chain.
+    """
+    BLOCK_RANGE = 10000
+
+    DID_REGISTERED_EVENT = 'DIDAttributeRegistered'
+    PROVIDER_ADDED_EVENT = 'DIDProviderAdded'
+    PROVIDER_REMOVED_EVENT = 'DIDProviderRemoved'
+    PERMISSION_GRANTED_EVENT = 'DIDPermissionGranted'
+    PERMISSION_REVOKED_EVENT = 'DIDPermissionRevoked'
+    FULFILLED_EVENT = 'Fulfilled'
+
+    def __init__(self, keeper, storage, from_block=0, block_range=None):
+        """
+        :param keeper: Keeper instance
+        :param storage: EventsIndexStorage instance
+        :param from_block: int first block to index
+        :param block_range: int maximum number of blocks requested at once
+        """
+        self._did_registry = keeper.did_registry
+        self._access_condition = keeper.access_secret_store_condition
+        self._storage = storage
+        self._from_block = from_block
+        self._block_range = block_range or self.BLOCK_RANGE
+        self._checkpoint_name = (f'{self._did_registry.address.lower()}:'
+                                 f'{self._access_condition.address.lower()}')
+        self._lock = threading.Lock()
+        self._background_sync_lock = threading.Lock()
+        self._synced_block = None
+        self._event_dispatcher = None
+
+    @property
+    def storage(self):
+        return self._storage
+
+    @property
+    def is_synced(self):
+        """Whether the index was synced at least once, it can then answer queries."""
+        return self._synced_block is not None
+
+    def start(self, event_dispatcher):
+        """
+        Sync the index in the background after every new block.
+
+        :param event_dispatcher: EventDispatcher notifying the new blocks
+        """
+        self._event_dispatcher = event_dispatcher
+        event_dispatcher.add_block_listener(self._on_new_block)
+
+    def stop(self):
+        """Stop the background sync."""
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.remove_block_listener(self._on_new_block)
+            self._event_dispatcher = None
+
+    def sync(self):
+        """
+        Index the events emitted since the last sync.
+
+        :return: int number of the last indexed block
+        """
+        with self._lock:
+            latest_block = Web3Provider.get_web3().eth.blockNumber
+            checkpoint = self._storage.get_checkpoint(self._checkpoint_name)
+            from_block = self._from_block if checkpoint is None else checkpoint + 1
+            while from_block <= latest_block:
+                to_block = min(from_block + self._block_range - 1, latest_block)
+                self._sync_range(from_block, to_block)
+                from_block = to_block + 1
+
+            self._synced_block = latest_block
+            return latest_block
+
+    def _on_new_block(self, block_number):
+        # A sync already running indexes this block too, or the next one does.
+        if not self._background_sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f'Syncing the events index failed at block {block_number}: {e}')
+        finally:
+            self._background_sync_lock.release()
+
+    def _sync_range(self, from_block, to_block):
+        logs = []
+        for contract, event_name in (
+                (self._did_registry, self.DID_REGISTERED_EVENT),
+                (self._did_registry, self.PROVIDER_ADDED_EVENT),
+                (self._did_registry, self.PROVIDER_REMOVED_EVENT),
+                (self._did_registry, self.PERMISSION_GRANTED_EVENT),
+                (self._did_registry, self.PERMISSION_REVOKED_EVENT),
+                (self._access_condition, self.FULFILLED_EVENT)):
+            logs.extend(get_event_logs(contract, event_name, from_block, to_block))
+        logs.sort(key=lambda log: (log.blockNumber, log.logIndex))
+
+        registrations = []
+        permissions = []
+        purchases = []
+        # The providers set at registration time are not part of any event, the providers
+        # of the DIDs touched in this range are read from the keeper once instead.
+        touched_dids = set()
+        for log in logs:
+            args = log.args
+            if log.event == self.DID_REGISTERED_EVENT:
+                registrations.append(
+                    (to_index_key(args['_did']), args['_owner'].lower(), log.blockNumber))
+                touched_dids.add(args['_did'])
+            elif log.event in (self.PROVIDER_ADDED_EVENT, self.PROVIDER_REMOVED_EVENT):
+                touched_dids.add(args['_did'])
+            elif log.event in (self.PERMISSION_GRANTED_EVENT, self.PERMISSION_REVOKED_EVENT):
+                permissions.append((to_index_key(args['_did']), args['_grantee'].lower(),
+                                    log.event == self.PERMISSION_GRANTED_EVENT))
+            elif log.event == self.FULFILLED_EVENT:
+                purchases.append((to_index_key(args['_agreementId']),
+                                  to_index_key(args['_documentId']),
+                                  args['_grantee'].lower(), log.blockNumber))
+
+        providers = {
+            to_index_key(did): self._did_registry.get_did_providers(did) or []
+            for did in touched_dids
+        }
+        self._storage.write_events(self._checkpoint_name, to_block, registrations, providers,
+                                   permissions, purchases)
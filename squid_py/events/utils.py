@@ -0,0 +1,32 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import logging
+
+from ocean_keeper.web3_provider import Web3Provider
+
+logger = logging.getLogger(__name__)
+
+
+def get_event_logs(contract, event_name, from_block, to_block, argument_filters=None):
+    """
+    Return all the logs of an event emitted in a range of blocks.
+
+    Unlike `EventFilter.get_all_entries`, errors are raised instead of being reported as an
+    empty list of logs.
+
+    :param contract: ContractBase instance emitting the event
+    :param event_name: str name of the event
+    :param from_block: int first block of the range
+    :param to_block: int last block of the range or 'latest'
+    :param argument_filters: dict of indexed event arguments to filter on
+    :return: list of event logs
+    """
+    event_filter = getattr(contract.events, event_name)().createFilter(
+        fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
+    try:
+        return event_filter.get_all_entries()
+    finally:
+        try:
+            Web3Provider.get_web3().eth.uninstallFilter(event_filter.filter_id)
+        except Exception as e:
+            logger.debug(f'Could not uninstall {event_name} filter: {e}')
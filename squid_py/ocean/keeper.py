@@ -5,19 +5,23 @@ from ocean_keeper import Keeper
 
 class SquidKeeper(Keeper):
 
+    def __init__(self, contract_names=None):
+        Keeper.__init__(self, contract_names)
+        # The condition contracts addresses never change for a given network.
+        self._condition_names = {
+            self.lock_reward_condition.address: 'lockReward',
+            self.access_secret_store_condition.address: 'accessSecretStore',
+            self.compute_execution_condition.address: 'execCompute',
+            self.escrow_reward_condition.address: 'escrowReward'
+        }
+
     @staticmethod
     def get_instance(contract_names=None):
         return SquidKeeper(contract_names)
 
     def get_condition_name_by_address(self, address):
         """Return the condition name for a given address."""
-        if self.lock_reward_condition.address == address:
-            return 'lockReward'
-        elif self.access_secret_store_condition.address == address:
-            return 'accessSecretStore'
-        elif self.compute_execution_condition.address == address:
-            return 'execCompute'
-        elif self.escrow_reward_condition.address == address:
-            return 'escrowReward'
-        else:
+        name = self._condition_names.get(address)
+        if name is None:
             logging.error(f'The current address {address} is not a condition address')
+        return name
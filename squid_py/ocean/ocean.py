@@ -7,11 +7,16 @@ import logging
 from deprecated import deprecated
 from ocean_keeper.contract_handler import ContractHandler
 from ocean_keeper.web3_provider import Web3Provider
-from ocean_utils.did_resolver.did_resolver import DIDResolver
 
 from squid_py.assets.asset_consumer import AssetConsumer
 from squid_py.assets.asset_executor import AssetExecutor
 from squid_py.config_provider import ConfigProvider
+from squid_py.data_store.agreements import AgreementsStorage
+from squid_py.data_store.events_index import EventsIndexStorage
+from squid_py.did_resolver.cached_did_resolver import CachedDIDResolver
+from squid_py.did_resolver.did_owner_cache import DIDOwnerCache
+from squid_py.events.event_dispatcher import EventDispatcher
+from squid_py.events.events_indexer import EventsIndexer
 from squid_py.ocean.keeper import SquidKeeper as Keeper
 from squid_py.ocean.ocean_accounts import OceanAccounts
 from squid_py.ocean.ocean_agreements import OceanAgreements
@@ -58,6 +63,12 @@ class Ocean:
            >> service_def_id = ddo.get_service(ServiceTypes.ASSET_ACCESS).service_definition_id
            >> service_agreement_id = ocean.assets.order(did, service_def_id, consumer_account)
 
+         * Resume the agreements still in progress when the application stopped, their state
+           is stored in `storage.path`. This is not done automatically, call it once per
+           consumer account at startup:
+
+           >> ocean.agreements.resume(consumer_account)
+
         An instance of Ocean is parameterized by a `Config` instance.
 
         :param config: Config instance
@@ -86,7 +97,28 @@ class Ocean:
             'EscrowReward'
         ]
         self._keeper = Keeper.get_instance(contracts)
-        self._did_resolver = DIDResolver(self._keeper.did_registry)
+        # A single thread polls the keeper events of all the sub-modules.
+        self._event_dispatcher = EventDispatcher()
+        self._did_resolver = CachedDIDResolver(
+            self._keeper.did_registry,
+            self._config.ddo_cache_size,
+            self._config.ddo_cache_ttl,
+            self._event_dispatcher
+        )
+        self._did_owners = DIDOwnerCache(
+            self._keeper.did_registry,
+            self._config.did_owner_cache_size,
+            self._config.did_owner_cache_ttl,
+            self._event_dispatcher
+        )
+        self._events_indexer = None
+        if self._config.events_index_enabled:
+            self._events_indexer = EventsIndexer(
+                self._keeper,
+                EventsIndexStorage(self._config.storage_path),
+                self._config.events_index_from_block
+            )
+            self._events_indexer.start(self._event_dispatcher)
 
         # Initialize the public sub-modules
         self.tokens = OceanTokens(self._keeper)
@@ -103,11 +135,15 @@ class Ocean:
             self.agreements,
             AssetConsumer,
             AssetExecutor,
-            self._config
+            self._config,
+            self._events_indexer,
+            self._did_owners
         )
         self.services = OceanServices()
-        self.ocean_providers = OceanProviders(self._keeper, self._did_resolver, self._config)
-        self.auth = OceanAuth(self._keeper, self._config.storage_path)
+        self.ocean_providers = OceanProviders(
+            self._keeper, self._did_resolver, self._config, self._events_indexer)
+        self.auth = OceanAuth(
+            self._keeper, self._config.storage_path, self._config.auth_token_cache_size)
 
         logger.debug('Squid Ocean instance initialized: ')
         logger.debug(f'\tOther accounts: {sorted([a.address for a in self.accounts.list()])}')
@@ -122,13 +158,27 @@ class Ocean:
         """Keeper instance."""
         return self._keeper
 
+    @property
+    def did_resolver(self):
+        """CachedDIDResolver instance shared by `assets` and `agreements`."""
+        return self._did_resolver
+
+    @property
+    def events_indexer(self):
+        """EventsIndexer instance, None unless `events_index.enabled` is set in the config."""
+        return self._events_indexer
+
     def _make_ocean_agreements(self):
         return OceanAgreements(
             self._keeper,
             self._did_resolver,
             AssetConsumer,
             AssetExecutor,
-            self._config
+            self._config,
+            self.templates,
+            AgreementsStorage(self._config.storage_path),
+            self._did_owners,
+            self._event_dispatcher
         )
 
     @deprecated("Use ocean.accounts.list")
@@ -2,8 +2,14 @@
 #  Copyright 2018 Ocean Protocol Foundation
 #  SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from ocean_keeper.exceptions import OceanInvalidTransaction
 from ocean_keeper.utils import add_ethereum_prefix_and_hash_msg
 from ocean_keeper.web3_provider import Web3Provider
 from ocean_utils.agreements.service_agreement import ServiceAgreement
@@ -19,21 +25,44 @@ from squid_py.agreement_events.accessSecretStore import consume_asset, refund_re
 from squid_py.agreement_events.computeExecution import execute_computation
 from squid_py.agreement_events.escrowAccessSecretStoreTemplate import fulfillLockRewardCondition
 from squid_py.brizo.brizo_provider import BrizoProvider
+from squid_py.data_store.agreements import AgreementStates
+from squid_py.did_resolver.did_owner_cache import DIDOwnerCache
+from squid_py.events.event_dispatcher import EventDispatcher
 from squid_py.ocean.ocean_conditions import OceanConditions
+from squid_py.ocean.ocean_templates import OceanTemplates
+from squid_py.utils.batch_call import BatchCall
+from squid_py.utils.transactions import send_transaction
+from squid_py.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger('ocean')
 
+PreparedAgreement = namedtuple(
+    'PreparedAgreement',
+    ('agreement_id', 'did', 'asset', 'service', 'template', 'condition_ids', 'publisher_address')
+)
+AgreementStatus = namedtuple('AgreementStatus', ('agreement_id', 'conditions'))
+
 
 class OceanAgreements:
     """Ocean agreements class."""
+    ACCESS_POLL_INTERVAL = 0.5  # seconds
+    ACCESS_POLL_MAX_INTERVAL = 8  # seconds
+    AGREEMENT_VALUES_CACHE_SIZE = 1024
 
-    def __init__(self, keeper, asset_resolver, asset_consumer, asset_executor, config):
+    def __init__(self, keeper, asset_resolver, asset_consumer, asset_executor, config,
+                 templates=None, agreements_storage=None, did_owners=None,
+                 event_dispatcher=None):
         self._keeper = keeper
         self._asset_resolver = asset_resolver
         self._asset_consumer = asset_consumer
         self._asset_executor = asset_executor
         self._config = config
+        self._templates = templates or OceanTemplates(self._keeper, self._config)
         self.conditions = OceanConditions(self._keeper)
+        self._event_dispatcher = event_dispatcher or EventDispatcher()
+        self._agreements_storage = agreements_storage
+        self._did_owners = did_owners or DIDOwnerCache(self._keeper.did_registry, 0)
+        self._agreement_values_cache = TTLCache(self.AGREEMENT_VALUES_CACHE_SIZE)
 
     def get(self, agreement_id):
         """
@@ -71,10 +100,11 @@ class OceanAgreements:
         asset = self._asset_resolver.resolve(did)
         service_agreement = asset.get_service_by_index(service_index)
 
-        publisher_address = self._keeper.did_registry.get_did_owner(asset.asset_id)
-        agreement_hash = service_agreement.get_service_agreement_hash(
-            agreement_id, asset.asset_id, consumer_account.address, publisher_address, self._keeper
-        )
+        publisher_address = self._did_owners.get_owner(asset.asset_id)
+        agreement_hash = self._get_agreement_values(
+            service_agreement, agreement_id, asset.asset_id, consumer_account.address,
+            publisher_address
+        )[1]
         signature = self._keeper.sign_hash(add_ethereum_prefix_and_hash_msg(agreement_hash),
                                            consumer_account)
         address = self._keeper.personal_ec_recover(agreement_hash, signature)
@@ -121,14 +151,16 @@ class OceanAgreements:
             f'Registering service agreement with id: {agreement_id}, auto-consume {auto_consume}')
         # TODO: refactor this to use same code in `create`
 
-        publisher_address = self._keeper.did_registry.get_did_owner(asset.asset_id)
-        condition_ids = service_agreement.generate_agreement_condition_ids(
-            agreement_id, asset.asset_id, consumer_account.address, publisher_address, self._keeper)
+        publisher_address = self._did_owners.get_owner(asset.asset_id)
+        condition_ids = self._get_agreement_values(
+            service_agreement, agreement_id, asset.asset_id, consumer_account.address,
+            publisher_address
+        )[0]
         from_block = Web3Provider.get_web3().eth.blockNumber
         self._process_consumer_agreement_events(
             agreement_id, did, service_agreement, consumer_account,
             condition_ids, publisher_address,
-            from_block, auto_consume
+            from_block, auto_consume, service_agreement.type
         )
 
         return BrizoProvider.get_brizo().initialize_service_agreement(
@@ -170,10 +202,99 @@ class OceanAgreements:
         assert account.address in self._keeper.accounts, \
             f'Unrecognized account address {account.address}'
 
-        agreement_template_approved = self._keeper.template_manager.is_template_approved(
-            self._keeper.escrow_access_secretstore_template.address)
-        agreement_exec_template_approved = self._keeper.template_manager.is_template_approved(
-            self._keeper.escrow_compute_execution_template.address)
+        self._check_templates_approved()
+        agreement = self._prepare_agreement(
+            did, index, agreement_id, service_agreement_signature, consumer_address, account)
+        success = agreement.template.create_agreement(
+            agreement_id,
+            agreement.asset.asset_id,
+            agreement.condition_ids,
+            agreement.service.conditions_timelocks,
+            agreement.service.conditions_timeouts,
+            consumer_address,
+            account
+        )
+        return self._process_created_agreement(
+            agreement, success, service_agreement_signature, consumer_address, account,
+            auto_consume
+        )
+
+    def create_many(self, orders, consumer_account, auto_consume=False, max_workers=10):
+        """
+        Execute several service agreements on-chain for the same consumer account.
+
+        The DDOs and the templates approval state are looked up once, all the `createAgreement`
+        transactions are sent back to back with consecutive nonces and their receipts are
+        then awaited concurrently.
+
+        :param orders: list of (did, index) tuples, see `create`
+        :param consumer_account: Account instance of the consumer creating the agreements
+        :param auto_consume: bool
+        :param max_workers: int maximum number of agreements prepared or awaited concurrently
+        :return: list of (agreement_id, error) tuples in the same order as `orders`. `error` is
+            the raised exception, or None if the agreement was created.
+        """
+        assert consumer_account.address in self._keeper.accounts, \
+            f'Unrecognized account address {consumer_account.address}'
+
+        self._check_templates_approved()
+        results = [None] * len(orders)
+        assets = {}
+        for did in {did for did, _ in orders}:
+            try:
+                assets[did] = self._asset_resolver.resolve(did)
+            except Exception as e:
+                assets[did] = e
+
+        def _prepare(_did, _index, _agreement_id):
+            if isinstance(assets[_did], Exception):
+                raise assets[_did]
+            return self._prepare_agreement(
+                _did, _index, _agreement_id, None, consumer_account.address, consumer_account,
+                asset=assets[_did]
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prepare_futures = [
+                executor.submit(_prepare, did, index, self.new()) for did, index in orders]
+
+            sent = []
+            for i, future in enumerate(prepare_futures):
+                agreement_id = None
+                try:
+                    agreement = future.result()
+                    agreement_id = agreement.agreement_id
+                    sent.append((i, agreement, self._send_create_agreement(
+                        agreement, consumer_account.address, consumer_account)))
+                except Exception as e:
+                    logger.error(f'Creating agreement for {orders[i]} failed: {str(e)}')
+                    results[i] = (agreement_id, e)
+
+            wait_futures = {
+                executor.submit(agreement.template.is_tx_successful, tx_hash): (i, agreement)
+                for i, agreement, tx_hash in sent
+            }
+            for future in as_completed(wait_futures):
+                i, agreement = wait_futures[future]
+                try:
+                    success = self._process_created_agreement(
+                        agreement, future.result(), None, consumer_account.address,
+                        consumer_account, auto_consume
+                    )
+                    error = None if success else OceanInvalidTransaction(
+                        f'Create agreement {agreement.agreement_id} failed.')
+                    results[i] = (agreement.agreement_id, error)
+                except Exception as e:
+                    results[i] = (agreement.agreement_id, e)
+
+        return results
+
+    def _check_templates_approved(self):
+        agreement_template_approved, agreement_exec_template_approved = \
+            self._templates.is_approved_many([
+                self._keeper.escrow_access_secretstore_template.address,
+                self._keeper.escrow_compute_execution_template.address
+            ])
         if not agreement_template_approved:
             msg = (f'The EscrowAccessSecretStoreTemplate contract at address '
                    f'{self._keeper.escrow_access_secretstore_template.address} is not '
@@ -182,13 +303,20 @@ class OceanAgreements:
             raise OceanInvalidAgreementTemplate(msg)
         if not agreement_exec_template_approved:
             msg = (f'The EscroComputeExecutionTemplate contract at address '
-                   f'{self._keeper.agreement_exec_template_approved.address} is not '
+                   f'{self._keeper.escrow_compute_execution_template.address} is not '
                    f'approved and cannot be used for creating service agreements.')
             logger.warning(msg)
             raise OceanInvalidAgreementTemplate(msg)
 
-        asset = self._asset_resolver.resolve(did)
-        asset_id = asset.asset_id
+    def _prepare_agreement(self, did, index, agreement_id, service_agreement_signature,
+                           consumer_address, account, asset=None):
+        """
+        Validate a new service agreement and compute its condition ids.
+
+        :return: PreparedAgreement instance
+        """
+        if asset is None:
+            asset = self._asset_resolver.resolve(did)
         service_agreement = asset.get_service_by_index(index)
         if service_agreement.type == ServiceTypes.ASSET_ACCESS:
             agreement_template = self._keeper.escrow_access_secretstore_template
@@ -215,20 +343,36 @@ class OceanAgreements:
                 )
 
         publisher_address = Web3Provider.get_web3().toChecksumAddress(asset.publisher)
-        condition_ids = service_agreement.generate_agreement_condition_ids(
-            agreement_id, asset_id, consumer_address, publisher_address, self._keeper)
+        condition_ids = self._get_agreement_values(
+            service_agreement, agreement_id, asset.asset_id, consumer_address, publisher_address
+        )[0]
+        return PreparedAgreement(agreement_id, did, asset, service_agreement, agreement_template,
+                                 condition_ids, publisher_address)
 
-        time_locks = service_agreement.conditions_timelocks
-        time_outs = service_agreement.conditions_timeouts
-        success = agreement_template.create_agreement(
-            agreement_id,
-            asset_id,
-            condition_ids,
-            time_locks,
-            time_outs,
-            consumer_address,
+    @staticmethod
+    def _send_create_agreement(agreement, consumer_address, account):
+        """
+        Send the `createAgreement` transaction without waiting for its receipt.
+
+        :return: hex str transaction hash
+        """
+        logger.debug(f'Creating agreement {agreement.agreement_id} with did={agreement.did}, '
+                     f'consumer={consumer_address}.')
+        return send_transaction(
+            agreement.template,
+            'createAgreement',
+            (agreement.agreement_id,
+             agreement.asset.asset_id,
+             agreement.condition_ids,
+             agreement.service.conditions_timelocks,
+             agreement.service.conditions_timeouts,
+             consumer_address),
             account
         )
+
+    def _process_created_agreement(self, agreement, success, service_agreement_signature,
+                                   consumer_address, account, auto_consume):
+        agreement_id = agreement.agreement_id
         ## TODO CHECK THIS FOR THE OTHER TEMPLATE
         if not success:
             # success is based on tx receipt which is not reliable.
@@ -249,8 +393,8 @@ class OceanAgreements:
         else:
             logger.info(f'Create agreement "{agreement_id}" failed.')
             self._log_agreement_info(
-                asset, service_agreement, agreement_id, service_agreement_signature,
-                consumer_address, account, condition_ids
+                agreement.asset, agreement.service, agreement_id, service_agreement_signature,
+                consumer_address, account, agreement.condition_ids
             )
 
         if success:
@@ -258,31 +402,87 @@ class OceanAgreements:
             if consumer_address == account.address:
                 from_block = Web3Provider.get_web3().eth.blockNumber - 10
                 self._process_consumer_agreement_events(
-                    agreement_id, did, service_agreement, account,
-                    condition_ids, publisher_address,
-                    from_block, auto_consume, service_agreement.type
+                    agreement_id, agreement.did, agreement.service, account,
+                    agreement.condition_ids, agreement.publisher_address,
+                    from_block, auto_consume, agreement.service.type
                 )
 
         return success
 
+    def resume(self, consumer_account):
+        """
+        Resume processing the agreements of `consumer_account` which were still in progress
+        when the client stopped, from the block of the last event processed for each one.
+
+        This must be called at startup, once per consumer account, it is not done when the
+        Ocean instance is created.
+
+        :param consumer_account: Account instance of the consumer
+        :return: list of the ids of the resumed agreements
+        """
+        if self._agreements_storage is None:
+            return []
+
+        resumed = []
+        for record in self._agreements_storage.get_pending_agreements(consumer_account.address):
+            try:
+                asset = self._asset_resolver.resolve(record.did)
+                service_agreement = ServiceAgreement.from_ddo(record.service_type, asset)
+            except Exception as e:
+                logger.warning(f'Cannot resume agreement {record.agreement_id}: {e}')
+                continue
+
+            logger.info(f'Resuming agreement {record.agreement_id} from state {record.status}, '
+                        f'block {record.block_number}.')
+            self._process_consumer_agreement_events(
+                record.agreement_id, record.did, service_agreement, consumer_account,
+                record.condition_ids, record.publisher_address, record.block_number,
+                record.auto_consume, record.service_type, status=record.status
+            )
+            resumed.append(record.agreement_id)
+
+        return resumed
+
+    def _update_agreement_state(self, agreement_id, status, event=None):
+        if self._agreements_storage is not None:
+            self._agreements_storage.update_status(
+                agreement_id, status, event.blockNumber if event else None)
+
     def _process_consumer_agreement_events(
             self, agreement_id, did, service_agreement, account,
-            condition_ids, publisher_address, from_block, auto_consume, agreement_type):
+            condition_ids, publisher_address, from_block, auto_consume, agreement_type,
+            status=None):
         logger.debug(
             f'process consumer events for agreement {agreement_id}, blockNumber {from_block + 10}')
-        if agreement_type == ServiceTypes.ASSET_ACCESS:
-            self._keeper.escrow_access_secretstore_template.subscribe_agreement_created(
-                agreement_id,
-                300,
-                fulfillLockRewardCondition,
-                (agreement_id, service_agreement.get_price(), account, condition_ids[1]),
-                from_block=from_block
-            )
-        else:
-            self._keeper.escrow_compute_execution_template.subscribe_agreement_created(
+        if status is None:
+            # A new agreement, resumed agreements are already stored.
+            status = AgreementStates.CREATED
+            if self._agreements_storage is not None:
+                self._agreements_storage.record_agreement(
+                    agreement_id, did, agreement_type, account.address, publisher_address,
+                    condition_ids, auto_consume, from_block
+                )
+
+        if status == AgreementStates.CREATED:
+            if agreement_type == ServiceTypes.ASSET_ACCESS:
+                template = self._keeper.escrow_access_secretstore_template
+            else:
+                template = self._keeper.escrow_compute_execution_template
+
+            def _lock_reward(event, *args):
+                # A failed lock leaves the agreement CREATED, so it is locked again on resume.
+                if fulfillLockRewardCondition(event, *args):
+                    self._update_agreement_state(agreement_id, AgreementStates.REWARD_LOCKED,
+                                                 event)
+                elif not event:
+                    self._update_agreement_state(agreement_id, AgreementStates.EXPIRED)
+
+            self._event_dispatcher.subscribe(
+                template,
+                template.AGREEMENT_CREATED_EVENT,
                 agreement_id,
                 300,
-                fulfillLockRewardCondition,
+                _lock_reward,
                 (agreement_id, service_agreement.get_price(), account, condition_ids[1]),
                 from_block=from_block
             )
@@ -291,43 +491,59 @@ class OceanAgreements:
             def _refund_callback(_price, _publisher_address, _condition_ids):
                 def do_refund(_event, _agreement_id, _did, _service_agreement, _consumer_account,
                               *_):
-                    refund_reward(
-                        _event, _agreement_id, _did, _service_agreement, _price,
-                        _consumer_account, _publisher_address, _condition_ids, _condition_ids[2]
-                    )
+                    if refund_reward(
+                            _event, _agreement_id, _did, _service_agreement, _price,
+                            _consumer_account, _publisher_address, _condition_ids,
+                            _condition_ids[2]):
+                        self._update_agreement_state(agreement_id, AgreementStates.REFUNDED)
 
                 return do_refund
 
+            def _consume_callback(_consume):
+                def do_consume(event, *args):
+                    self._update_agreement_state(
+                        agreement_id, AgreementStates.ACCESS_GRANTED, event)
+                    # The download and the execution raise when they fail, the agreement then
+                    # stays ACCESS_GRANTED and is consumed again on resume.
+                    if _consume(event, *args):
+                        self._update_agreement_state(agreement_id, AgreementStates.CONSUMED)
+
+                return do_consume
+
             conditions_dict = service_agreement.condition_by_name
             if agreement_type == ServiceTypes.ASSET_ACCESS:
-                self._keeper.access_secret_store_condition.subscribe_condition_fulfilled(
-                    agreement_id,
-                    max(conditions_dict['accessSecretStore'].timeout, 300),
-                    consume_asset,
-                    (agreement_id, did, service_agreement, account, self._asset_consumer.download,
-                     self._config.secret_store_url, self._config.parity_url,
-                     self._config.downloads_path),
-                    timeout_callback=_refund_callback(
-                        service_agreement.get_price(), publisher_address, condition_ids
-                    ),
-                    from_block=from_block
-                )
+                condition = self._keeper.access_secret_store_condition
+                timeout = max(conditions_dict['accessSecretStore'].timeout, 300)
+                callback = _consume_callback(consume_asset)
+                args = (agreement_id, did, service_agreement, account,
+                        self._asset_consumer.download, self._config.secret_store_url,
+                        self._config.parity_url, self._config.downloads_path)
             else:
-                self._keeper.compute_execution_condition.subscribe_condition_fulfilled(
-                    agreement_id,
-                    max(conditions_dict['execCompute'].timeout, 300),
-                    execute_computation,
-                    (agreement_id, did, service_agreement, account, self._asset_executor.execute),
-                    timeout_callback=_refund_callback(
-                        service_agreement.get_price(), publisher_address, condition_ids
-                    ),
-                    from_block=from_block
-                )
+                condition = self._keeper.compute_execution_condition
+                timeout = max(conditions_dict['execCompute'].timeout, 300)
+                callback = _consume_callback(execute_computation)
+                args = (agreement_id, did, service_agreement, account,
+                        self._asset_executor.execute)
+
+            self._event_dispatcher.subscribe(
+                condition,
+                condition.FULFILLED_EVENT,
+                agreement_id,
+                timeout,
+                callback,
+                args,
+                timeout_callback=_refund_callback(
+                    service_agreement.get_price(), publisher_address, condition_ids
+                ),
+                from_block=from_block
+            )
 
     def _log_agreement_info(self, asset, service_agreement, agreement_id, agreement_signature,
                             consumer_address, publisher_account, condition_ids):
-        agreement_hash = service_agreement.get_service_agreement_hash(
-            agreement_id, asset.asset_id, consumer_address, publisher_account.address, self._keeper)
+        agreement_hash = self._get_agreement_values(
+            service_agreement, agreement_id, asset.asset_id, consumer_address,
+            publisher_account.address
+        )[1]
         publisher_ether_balance = self._keeper.get_ether_balance(publisher_account.address)
         logger.debug(
             f'Agreement parameters:'
@@ -372,6 +588,95 @@ class OceanAgreements:
             document_id, consumer_address
         )
 
+    def wait_for_access(self, agreement_id, did, consumer_address, timeout=60):
+        """
+        Wait until the `consumer_address` has permission to access the asset `did` according
+        to the `agreement_id`.
+
+        Returns as soon as the AccessSecretStoreCondition Fulfilled event of the agreement is
+        received. The permission is also polled, with an exponential backoff, in case the event
+        is missed.
+
+        :param agreement_id: id of the agreement, hex str
+        :param did: DID, str
+        :param consumer_address: ethereum account address of consumer, hex str
+        :param timeout: float seconds to wait
+        :return: bool True if the access was granted before `timeout`
+        """
+        deadline = time.monotonic() + timeout
+        fulfilled = threading.Event()
+        subscription = self._subscribe_access_fulfilled(
+            agreement_id, timeout, lambda event, *_: event is not None and fulfilled.set())
+
+        try:
+            interval = self.ACCESS_POLL_INTERVAL
+            while not self.is_access_granted(agreement_id, did, consumer_address):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+
+                if fulfilled.wait(min(interval, remaining)):
+                    # The event was received but the permission is not visible yet, poll again.
+                    fulfilled.clear()
+                interval = min(interval * 2, self.ACCESS_POLL_MAX_INTERVAL)
+
+            return True
+        finally:
+            self._event_dispatcher.unsubscribe(subscription)
+
+    async def wait_for_access_async(self, agreement_id, did, consumer_address, timeout=60):
+        """
+        Coroutine version of `wait_for_access`, the waiting costs no thread.
+
+        :param agreement_id: id of the agreement, hex str
+        :param did: DID, str
+        :param consumer_address: ethereum account address of consumer, hex str
+        :param timeout: float seconds to wait
+        :return: bool True if the access was granted before `timeout`
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        fulfilled = asyncio.Event()
+
+        def _on_fulfilled(event, *_):
+            if event is not None:
+                loop.call_soon_threadsafe(fulfilled.set)
+
+        # Subscribing makes RPC calls, like polling the permission it runs in the executor.
+        subscription = await loop.run_in_executor(
+            None, self._subscribe_access_fulfilled, agreement_id, timeout, _on_fulfilled)
+
+        try:
+            interval = self.ACCESS_POLL_INTERVAL
+            while not await loop.run_in_executor(
+                    None, self.is_access_granted, agreement_id, did, consumer_address):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+
+                try:
+                    await asyncio.wait_for(fulfilled.wait(), min(interval, remaining))
+                    fulfilled.clear()
+                except asyncio.TimeoutError:
+                    pass
+                interval = min(interval * 2, self.ACCESS_POLL_MAX_INTERVAL)
+
+            return True
+        finally:
+            await loop.run_in_executor(None, self._event_dispatcher.unsubscribe, subscription)
+
+    def _subscribe_access_fulfilled(self, agreement_id, timeout, callback):
+        condition = self._keeper.access_secret_store_condition
+        # Start a few blocks back so an event emitted right before subscribing is not missed.
+        return self._event_dispatcher.subscribe(
+            condition,
+            condition.FULFILLED_EVENT,
+            agreement_id,
+            timeout,
+            callback,
+            from_block=max(Web3Provider.get_web3().eth.blockNumber - 10, 0)
+        )
+
     def _verify_service_agreement_signature(self, did, agreement_id, service_index,
                                             consumer_address, signature, ddo=None):
         """
@@ -394,9 +699,10 @@ class OceanAgreements:
             ddo = self._asset_resolver.resolve(did)
 
         service_agreement = ddo.get_service_by_index(service_index)
-        agreement_hash = service_agreement.get_service_agreement_hash(
-            agreement_id, ddo.asset_id, consumer_address,
-            Web3Provider.get_web3().toChecksumAddress(ddo.proof['creator']), self._keeper)
+        agreement_hash = self._get_agreement_values(
+            service_agreement, agreement_id, ddo.asset_id, consumer_address,
+            Web3Provider.get_web3().toChecksumAddress(ddo.proof['creator'])
+        )[1]
 
         recovered_address = self._keeper.personal_ec_recover(agreement_hash, signature)
         is_valid = (recovered_address == consumer_address)
@@ -405,6 +711,38 @@ class OceanAgreements:
 
         return is_valid
 
+    def _get_agreement_values(self, service_agreement, agreement_id, asset_id, consumer_address,
+                              publisher_address):
+        """
+        Condition ids and hash of an agreement, computed once per agreement.
+
+        :param service_agreement: ServiceAgreement instance
+        :param agreement_id: id of the agreement, hex str
+        :param asset_id: hex str
+        :param consumer_address: ethereum account address of consumer, hex str
+        :param publisher_address: ethereum account address of publisher, hex str
+        :return: tuple (condition_ids, agreement_hash), same values as
+            `ServiceAgreement.generate_agreement_condition_ids` and
+            `ServiceAgreement.get_service_agreement_hash`
+        """
+        key = (agreement_id, asset_id, service_agreement.index, consumer_address.lower(),
+               publisher_address.lower())
+        values = self._agreement_values_cache.get(key)
+        if values is None:
+            condition_ids = service_agreement.generate_agreement_condition_ids(
+                agreement_id, asset_id, consumer_address, publisher_address, self._keeper)
+            agreement_hash = ServiceAgreement.generate_service_agreement_hash(
+                service_agreement.template_id,
+                condition_ids,
+                service_agreement.conditions_timelocks,
+                service_agreement.conditions_timeouts,
+                agreement_id,
+                self._keeper.generate_multi_value_hash
+            )
+            values = (condition_ids, agreement_hash)
+            self._agreement_values_cache.set(key, values)
+        return values
+
     def _approve_token_transfer(self, amount, consumer_account):
         if self._keeper.token.get_token_balance(consumer_account.address) < amount:
             raise ValueError(
@@ -422,12 +760,36 @@ class OceanAgreements:
         :return: dict with condition status of each of the agreement's conditions or None if the
         agreement is invalid.
         """
-        condition_ids = self._keeper.agreement_manager.get_agreement(agreement_id).condition_ids
-        result = {"agreementId": agreement_id}
-        conditions = dict()
-        for i in condition_ids:
-            conditions[self._keeper.get_condition_name_by_address(
-                self._keeper.condition_manager.get_condition(
-                    i).type_ref)] = self._keeper.condition_manager.get_condition_state(i)
-        result["conditions"] = conditions
-        return result
+        status = self.status_many([agreement_id])[0]
+        return {"agreementId": agreement_id, "conditions": status.conditions}
+
+    def status_many(self, agreement_ids):
+        """
+        Get the status of several service agreements.
+
+        The agreements and then their conditions are read in JSON-RPC batch requests, so the
+        number of round trips does not depend on the number of agreements.
+
+        :param agreement_ids: list of ids of agreements, hex str
+        :return: list of AgreementStatus tuples (agreement_id, conditions) in the same order as
+            `agreement_ids`. `conditions` is a dict with the state of each of the agreement's
+            conditions, it is empty if the agreement does not exist.
+        """
+        batch = BatchCall()
+        for agreement_id in agreement_ids:
+            batch.add(self._keeper.agreement_manager, 'getAgreement', agreement_id)
+        agreements_condition_ids = [agreement[3] for agreement in batch.execute()]
+
+        for condition_ids in agreements_condition_ids:
+            for condition_id in condition_ids:
+                batch.add(self._keeper.condition_manager, 'getCondition', condition_id)
+        conditions = iter(batch.execute())
+
+        statuses = []
+        for agreement_id, condition_ids in zip(agreement_ids, agreements_condition_ids):
+            states = dict()
+            for _ in condition_ids:
+                type_ref, state = next(conditions)[:2]
+                states[self._keeper.get_condition_name_by_address(type_ref)] = state
+            statuses.append(AgreementStatus(agreement_id, states))
+        return statuses
@@ -6,8 +6,12 @@ import copy
 import json
 import logging
 import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from eth_utils import add_0x_prefix
+from ocean_keeper.exceptions import OceanInvalidTransaction
 from ocean_keeper.utils import add_ethereum_prefix_and_hash_msg
 from ocean_keeper.web3_provider import Web3Provider
 from ocean_utils.agreements.service_factory import ServiceDescriptor, ServiceFactory
@@ -23,23 +27,41 @@ from ocean_utils.exceptions import (
 )
 from ocean_utils.utils.utilities import checksum
 
+from squid_py.assets.asset_record import AssetRecord
+from squid_py.assets.did_index import DIDIndex
 from squid_py.brizo.brizo_provider import BrizoProvider
+from squid_py.did_resolver.did_owner_cache import DIDOwnerCache
 from squid_py.secret_store.secret_store_provider import SecretStoreProvider
+from squid_py.utils.batch_call import BatchCall
+from squid_py.utils.transactions import send_transaction
+from squid_py.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger('ocean')
 
+AssetResult = namedtuple('AssetResult', ('did', 'ddo', 'error'))
+OrderResult = namedtuple('OrderResult', ('did', 'index', 'agreement_id', 'error'))
+
 
 class OceanAssets:
     """Ocean assets class."""
+    DEFAULT_MAX_WORKERS = 10
 
-    def __init__(self, keeper, did_resolver, agreements, asset_consumer, asset_executor, config):
+    def __init__(self, keeper, did_resolver, agreements, asset_consumer, asset_executor, config,
+                 events_indexer=None, did_owners=None):
         self._keeper = keeper
         self._did_resolver = did_resolver
         self._agreements = agreements
         self._asset_consumer = asset_consumer
         self._asset_executor = asset_executor
         self._config = config
+        self._events_indexer = events_indexer
+        self._did_owners = did_owners or DIDOwnerCache(self._keeper.did_registry, 0)
         self._aquarius_url = config.aquarius_url
+        self._register_lock = threading.Lock()
+        self._did_index = None
+        if config.did_index_capacity:
+            self._did_index = DIDIndex(config.did_index_capacity)
+        self._search_cache = TTLCache(config.search_cache_size, config.search_cache_ttl)
 
         downloads_path = os.path.join(os.getcwd(), 'downloads')
         if self._config.has_option('resources', 'downloads.path'):
@@ -95,23 +117,11 @@ class OceanAssets:
         _service_descriptors.extend(service_type_to_descriptor.values())
         return ServiceFactory.build_services(_service_descriptors)
 
-    def create(self, metadata, publisher_account,
-               service_descriptors=None, providers=None,
-               use_secret_store=True):
+    def _prepare_ddo(self, metadata, publisher_account, service_descriptors, use_secret_store):
         """
-        Register an asset in both the keeper's DIDRegistry (on-chain) and in the Metadata store (
-        Aquarius).
+        Build the DDO of a new asset: services, proof, did, signature and encrypted files.
 
-        :param metadata: dict conforming to the Metadata accepted by Ocean Protocol.
-        :param publisher_account: Account of the publisher registering this asset
-        :param service_descriptors: list of ServiceDescriptor tuples of length 2.
-            The first item must be one of ServiceTypes and the second
-            item is a dict of parameters and values required by the service
-        :param providers: list of addresses of providers of this asset (a provider is
-            an ethereum account that is authorized to provide asset services)
-        :param use_secret_store: bool indicate whether to use the secret store directly for
-            encrypting urls (Uses Brizo provider service if set to False)
-        :return: DDO instance
+        :return: tuple (ddo: DDO instance, ddo_service_endpoint: str)
         """
         assert isinstance(metadata, dict), f'Expected metadata of type dict, got {type(metadata)}'
         assert service_descriptors is None or isinstance(service_descriptors, list), \
@@ -143,7 +153,7 @@ class OceanAssets:
         did = ddo.assign_did(DID.did(ddo.proof['checksum']))
         logger.debug(f'Generating new did: {did}')
         # Check if it's already registered first!
-        if did in self._get_aquarius().list_assets():
+        if self._is_did_registered(did):
             raise OceanDIDAlreadyExist(
                 f'Asset id {did} is already registered to another asset.')
 
@@ -221,6 +231,29 @@ class OceanAssets:
         logger.debug(
             f'Generated ddo and services, DID is {ddo.did},'
             f' metadata service @{ddo_service_endpoint}.')
+        return ddo, ddo_service_endpoint
+
+    def create(self, metadata, publisher_account,
+               service_descriptors=None, providers=None,
+               use_secret_store=True):
+        """
+        Register an asset in both the keeper's DIDRegistry (on-chain) and in the Metadata store (
+        Aquarius).
+
+        :param metadata: dict conforming to the Metadata accepted by Ocean Protocol.
+        :param publisher_account: Account of the publisher registering this asset
+        :param service_descriptors: list of ServiceDescriptor tuples of length 2.
+            The first item must be one of ServiceTypes and the second
+            item is a dict of parameters and values required by the service
+        :param providers: list of addresses of providers of this asset (a provider is
+            an ethereum account that is authorized to provide asset services)
+        :param use_secret_store: bool indicate whether to use the secret store directly for
+            encrypting urls (Uses Brizo provider service if set to False)
+        :return: DDO instance
+        """
+        ddo, ddo_service_endpoint = self._prepare_ddo(
+            metadata, publisher_account, service_descriptors, use_secret_store)
+        did = ddo.did
         response = None
 
         # register on-chain
@@ -235,10 +268,10 @@ class OceanAssets:
             logger.warning(f'Registering {did} on-chain failed.')
             return None
         logger.info(f'Successfully registered DDO (DID={did}) on chain.')
+        self._add_known_did(did)
         try:
             # publish the new ddo in ocean-db/Aquarius
-            response = self._get_aquarius().publish_asset_ddo(ddo)
-            logger.info('Asset/ddo published successfully in aquarius.')
+            response = self._publish_in_aquarius(ddo)
         except ValueError as ve:
             raise ValueError(f'Invalid value to publish in the metadata: {str(ve)}')
         except Exception as e:
@@ -247,6 +280,128 @@ class OceanAssets:
             return None
         return ddo
 
+    def create_many(self, metadata_list, publisher_account,
+                    service_descriptors=None, providers=None,
+                    use_secret_store=True, max_workers=None):
+        """
+        Register a batch of assets in both the keeper's DIDRegistry (on-chain) and in the
+        Metadata store (Aquarius).
+
+        Publishing runs as two pipelined stages, each one with at most `max_workers` assets
+        in progress: building the DDO (services, proof signature and files encryption), then
+        registering it on-chain and publishing it in Aquarius. The `registerAttribute`
+        transactions are sent one at a time so that nonces of the publisher account are
+        assigned in order, while waiting for the receipts and publishing to Aquarius is done
+        concurrently.
+
+        :param metadata_list: list of dicts conforming to the Metadata accepted by Ocean Protocol.
+        :param publisher_account: Account of the publisher registering these assets
+        :param service_descriptors: list of ServiceDescriptor tuples used for every asset,
+            see `create`
+        :param providers: list of addresses of providers of these assets
+        :param use_secret_store: bool indicate whether to use the secret store directly for
+            encrypting urls (Uses Brizo provider service if set to False)
+        :param max_workers: int maximum number of concurrent tasks in each stage, defaults to
+            `DEFAULT_MAX_WORKERS`
+        :return: list of AssetResult tuples (did, ddo, error) in the same order as
+            `metadata_list`. `ddo` is None and `error` is the raised exception if publishing
+            that asset failed.
+        """
+        max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        results = [None] * len(metadata_list)
+        with ThreadPoolExecutor(max_workers=max_workers) as prepare_executor, \
+                ThreadPoolExecutor(max_workers=max_workers) as publish_executor:
+            prepare_futures = {
+                prepare_executor.submit(
+                    self._prepare_ddo, metadata, publisher_account,
+                    copy.deepcopy(service_descriptors), use_secret_store
+                ): i for i, metadata in enumerate(metadata_list)
+            }
+            publish_futures = {}
+            for future in as_completed(prepare_futures):
+                i = prepare_futures[future]
+                try:
+                    ddo, ddo_service_endpoint = future.result()
+                except Exception as e:
+                    logger.error(f'Preparing asset #{i} of the batch failed: {str(e)}')
+                    results[i] = AssetResult(None, None, e)
+                    continue
+
+                publish_futures[publish_executor.submit(
+                    self._register_and_publish, ddo, ddo_service_endpoint,
+                    publisher_account, providers
+                )] = i, ddo
+
+            for future in as_completed(publish_futures):
+                i, ddo = publish_futures[future]
+                try:
+                    future.result()
+                    results[i] = AssetResult(ddo.did, ddo, None)
+                except Exception as e:
+                    logger.error(f'Publishing asset {ddo.did} failed: {str(e)}')
+                    results[i] = AssetResult(ddo.did, None, e)
+
+        return results
+
+    def _register_and_publish(self, ddo, ddo_service_endpoint, account, providers):
+        did_registry = self._keeper.did_registry
+        asset_id_bytes = Web3Provider.get_web3().toBytes(hexstr=ddo.asset_id)
+        with self._register_lock:
+            tx_hash = send_transaction(
+                did_registry,
+                'registerAttribute',
+                (asset_id_bytes,
+                 asset_id_bytes,
+                 providers or [],
+                 ddo_service_endpoint),
+                account
+            )
+
+        receipt = did_registry.get_tx_receipt(tx_hash)
+        if not (receipt and receipt.status == 1) \
+                and not did_registry.get_block_number_updated(asset_id_bytes):
+            raise OceanInvalidTransaction(f'Registering {ddo.did} on-chain failed.')
+        logger.info(f'Successfully registered DDO (DID={ddo.did}) on chain.')
+        self._add_known_did(ddo.did)
+
+        return self._publish_in_aquarius(ddo)
+
+    def _is_did_registered(self, did):
+        """
+        Check whether `did` is already registered, either on-chain or in Aquarius.
+
+        DIDs in the local index are answered without any request, otherwise
+        the DIDRegistry is probed first and Aquarius is asked for this DID only.
+
+        :param did: DID, str
+        :return: bool
+        """
+        if self._did_index is not None and did in self._did_index:
+            return True
+
+        registered = bool(self._keeper.did_registry.get_block_number_updated(did_to_id_bytes(did)))
+        if not registered:
+            try:
+                registered = bool(self._get_aquarius().get_asset_ddo(did))
+            except ValueError:
+                # Aquarius responds with a plain text error message for unknown DIDs
+                registered = False
+
+        if registered:
+            self._add_known_did(did)
+        return registered
+
+    def _add_known_did(self, did):
+        if self._did_index is not None:
+            self._did_index.add(did)
+
+    def _publish_in_aquarius(self, ddo):
+        # publish the new ddo in ocean-db/Aquarius
+        response = self._get_aquarius().publish_asset_ddo(ddo)
+        self._search_cache.clear()
+        logger.info('Asset/ddo published successfully in aquarius.')
+        return response
+
     def retire(self, did):
         """
         Retire this did of Aquarius
@@ -258,6 +413,8 @@ class OceanAssets:
             ddo = self.resolve(did)
             metadata_service = ddo.get_service(ServiceTypes.METADATA)
             self._get_aquarius(metadata_service.service_endpoint).retire_asset_ddo(did)
+            self._did_resolver.invalidate(did)
+            self._search_cache.clear()
             return True
         except AquariusGenericError as err:
             logger.error(err)
@@ -272,7 +429,24 @@ class OceanAssets:
         """
         return self._did_resolver.resolve(did)
 
-    def search(self, text, sort=None, offset=100, page=1, aquarius_url=None):
+    def resolve_many(self, dids, max_workers=None):
+        """
+        Retrieve the ddos associated with a batch of dids.
+
+        The on-chain lookups and the requests to Aquarius run concurrently, an error in
+        resolving one did does not fail the whole batch.
+
+        :param dids: list of DID, str
+        :param max_workers: int maximum number of concurrent requests, defaults to
+            `DEFAULT_MAX_WORKERS`
+        :return: list of AssetResult tuples (did, ddo, error) in the same order as `dids`.
+            `ddo` is None and `error` is the raised exception if resolving that did failed.
+        """
+        results = self._did_resolver.resolve_many(
+            dids, max_workers=max_workers or self.DEFAULT_MAX_WORKERS)
+        return [AssetResult(did, ddo, error) for did, (ddo, error) in zip(dids, results)]
+
+    def search(self, text, sort=None, offset=100, page=1, aquarius_url=None, lazy=False):
         """
         Search an asset in oceanDB using aquarius.
 
@@ -282,14 +456,20 @@ class OceanAssets:
         :param page: Page number
         :param aquarius_url: Url of the aquarius where you want to search. If there is not
             provided take the default
+        :param lazy: bool, return `AssetRecord` instances which only build the DDO when it is
+            needed
         :return: List of assets that match with the query
         """
         assert page >= 1, f'Invalid page value {page}. Required page >= 1.'
         logger.info(f'Searching asset containing: {text}')
-        return [DDO(dictionary=ddo_dict) for ddo_dict in
-                self._get_aquarius(aquarius_url).text_search(text, sort, offset, page)['results']]
+        results = self._get_search_results(
+            'text', text, sort, offset, page, aquarius_url,
+            lambda aquarius: aquarius.text_search(text, sort, offset, page)
+        )
+        result_type = AssetRecord if lazy else self._ddo_from_dict
+        return [result_type(ddo_dict) for ddo_dict in results]
 
-    def query(self, query, sort=None, offset=100, page=1, aquarius_url=None):
+    def query(self, query, sort=None, offset=100, page=1, aquarius_url=None, lazy=False):
         """
         Search an asset in oceanDB using search query.
 
@@ -300,12 +480,146 @@ class OceanAssets:
         :param page: Page number
         :param aquarius_url: Url of the aquarius where you want to search. If there is not
             provided take the default
+        :param lazy: bool, return `AssetRecord` instances which only build the DDO when it is
+            needed
         :return: List of assets that match with the query.
         """
         logger.info(f'Searching asset query: {query}')
+        results = self._get_search_results(
+            'query', query, sort, offset, page, aquarius_url,
+            lambda aquarius: aquarius.query_search(dict(query), sort, offset, page)
+        )
+        result_type = AssetRecord if lazy else self._ddo_from_dict
+        return [result_type(ddo_dict) for ddo_dict in results]
+
+    def iter_search(self, text, sort=None, offset=100, page=1, aquarius_url=None,
+                    lazy=False):
+        """
+        Iterate over all the assets matching `text`, see `search`.
+
+        The pages are requested one at a time from aquarius, the next page is fetched in the
+        background while the current one is being consumed.
+
+        :param text: String with the value that you are searching
+        :param sort: Dictionary to choose order main in some value
+        :param offset: Number of elements requested by page
+        :param page: Number of the first page
+        :param aquarius_url: Url of the aquarius where you want to search. If there is not
+            provided take the default
+        :param lazy: bool, return `AssetRecord` instances which only build the DDO when it is
+            needed
+        :return: generator of DDO or AssetRecord instances
+        """
+        assert page >= 1, f'Invalid page value {page}. Required page >= 1.'
+        logger.info(f'Iterating over assets containing: {text}')
         aquarius = self._get_aquarius(aquarius_url)
-        return [DDO(dictionary=ddo_dict) for ddo_dict in
-                aquarius.query_search(query, sort, offset, page)['results']]
+        return self._iter_pages(
+            lambda _page: aquarius.text_search(text, sort, offset, _page),
+            page,
+            AssetRecord if lazy else self._ddo_from_dict
+        )
+
+    def iter_query(self, query, sort=None, offset=100, page=1, aquarius_url=None,
+                   lazy=False):
+        """
+        Iterate over all the assets matching the search `query`, see `query`.
+
+        The pages are requested one at a time from aquarius, the next page is fetched in the
+        background while the current one is being consumed.
+
+        :param query: dict with query parameters
+            (e.g.) https://github.com/oceanprotocol/aquarius/blob/develop/docs/for_api_users/API.md
+        :param sort: Dictionary to choose order main in some value
+        :param offset: Number of elements requested by page
+        :param page: Number of the first page
+        :param aquarius_url: Url of the aquarius where you want to search. If there is not
+            provided take the default
+        :param lazy: bool, return `AssetRecord` instances which only build the DDO when it is
+            needed
+        :return: generator of DDO or AssetRecord instances
+        """
+        assert page >= 1, f'Invalid page value {page}. Required page >= 1.'
+        logger.info(f'Iterating over assets matching query: {query}')
+        aquarius = self._get_aquarius(aquarius_url)
+        # `query_search` sets the paging keys on the query it is given, so each request
+        # gets its own copy.
+        return self._iter_pages(
+            lambda _page: aquarius.query_search(dict(query), sort, offset, _page),
+            page,
+            AssetRecord if lazy else self._ddo_from_dict
+        )
+
+    def _get_search_results(self, kind, query, sort, offset, page, aquarius_url, search):
+        """
+        Return the results of an aquarius search, from the search cache when enabled.
+
+        Cached results are shared between callers and must not be modified.
+
+        :param kind: str type of search, part of the cache key
+        :param query: str text or dict query of the search
+        :param sort: Dictionary to choose order main in some value
+        :param offset: Number of elements shows by page
+        :param page: Page number
+        :param aquarius_url: Url of the aquarius to search, None for the default
+        :param search: function taking an Aquarius instance and returning the search response
+        :return: list of DDO dictionaries
+        """
+        aquarius_url = aquarius_url or self._aquarius_url
+        key = (kind, aquarius_url, json.dumps(query, sort_keys=True),
+               json.dumps(sort, sort_keys=True), offset, page)
+        results = self._search_cache.get(key)
+        if results is None:
+            version = self._search_cache.version
+            results = search(self._get_aquarius(aquarius_url))['results']
+            self._search_cache.set(key, results, version)
+        return results
+
+    def clear_search_cache(self):
+        """Drop all the cached search results."""
+        self._search_cache.clear()
+
+    @staticmethod
+    def _ddo_from_dict(ddo_dict):
+        return DDO(dictionary=ddo_dict)
+
+    @staticmethod
+    def _iter_pages(fetch_page, page, result_type):
+        """
+        Yield the assets of consecutive search result pages, starting at `page`.
+
+        Iteration stops on the first empty page or once the `total_pages` or `total_results`
+        reported by aquarius are reached. Only the current page and the one being prefetched
+        are held in memory.
+
+        :param fetch_page: function taking a page number and returning the search response
+        :param page: int number of the first page
+        :param result_type: function creating the yielded instances from a DDO dictionary
+        :return: generator of `result_type` instances
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(fetch_page, page)
+            count = 0
+            while future is not None:
+                response = future.result()
+                if isinstance(response, dict):
+                    results = response.get('results') or []
+                    total_pages = response.get('total_pages')
+                    total_results = response.get('total_results')
+                else:
+                    results = response or []
+                    total_pages = total_results = None
+
+                count += len(results)
+                is_last_page = (not results
+                                or (total_pages is not None and page >= total_pages)
+                                or (total_results is not None and count >= total_results))
+                page += 1
+                future = None if is_last_page else executor.submit(fetch_page, page)
+                for ddo_dict in results:
+                    yield result_type(ddo_dict)
+        finally:
+            executor.shutdown(wait=False)
 
     def order(self, did, index, consumer_account, auto_consume=False):
         """
@@ -333,6 +647,29 @@ class OceanAssets:
         )
         return agreement_id
 
+    def order_many(self, orders, consumer_account, auto_consume=False, max_workers=None):
+        """
+        Place several orders by creating their agreements on-chain together.
+
+        The agreements transactions are sent one after the other without waiting for their
+        receipts, which are then awaited concurrently, see `OceanAgreements.create_many`.
+
+        :param orders: list of (did, index) tuples, see `order`
+        :param consumer_account: Account instance of the consumer
+        :param auto_consume: boolean
+        :param max_workers: int maximum number of concurrent requests, defaults to
+            `DEFAULT_MAX_WORKERS`
+        :return: list of OrderResult tuples (did, index, agreement_id, error) in the same order
+            as `orders`. `error` is None if the agreement was created, otherwise it is the raised
+            exception.
+        """
+        results = self._agreements.create_many(
+            orders, consumer_account, auto_consume=auto_consume,
+            max_workers=max_workers or self.DEFAULT_MAX_WORKERS
+        )
+        return [OrderResult(did, index, agreement_id, error)
+                for (did, index), (agreement_id, error) in zip(orders, results)]
+
     def consume(self, service_agreement_id, did, service_index, consumer_account,
                 destination, index=None):
         """
@@ -351,6 +688,8 @@ class OceanAssets:
         :param consumer_account: Account instance of the consumer
         :param destination: str path
         :param index: Index of the document that is going to be downloaded, int
+        :raises DownloadError: if any of the files could not be downloaded, its `results` give
+            the outcome of each file
         :return: str path to saved files
         """
         ddo = self.resolve(did)
@@ -368,6 +707,32 @@ class OceanAssets:
             index
         )
 
+    def consume_stream(self, service_agreement_id, did, consumer_account, index=None):
+        """
+        Consume the asset data without saving it to disk.
+
+        Like `consume`, but the content of the asset datafiles is streamed from the service
+        endpoint, so it can be handed over to a parser or uploaded elsewhere directly. The files
+        are requested one after the other, the chunks of each file have to be consumed before
+        moving to the next one.
+
+        :param service_agreement_id: str
+        :param did: DID, str
+        :param consumer_account: Account instance of the consumer
+        :param index: Index of the document that is going to be streamed, int
+        :return: generator of tuples (index, name, chunks), chunks being an iterator of the
+            bytes of the file content
+        """
+        ddo = self.resolve(did)
+        return self._asset_consumer.stream(
+            service_agreement_id,
+            ddo,
+            consumer_account,
+            BrizoProvider.get_brizo(),
+            self._get_secret_store(consumer_account),
+            index
+        )
+
     def validate(self, metadata):
         """
         Validate that the metadata is ok to be stored in aquarius.
@@ -385,7 +750,17 @@ class OceanAssets:
         :return: the ethereum address of the owner/publisher of given asset did, hex-str
         """
         # return self._get_aquarius(self._aquarius_url).get_asset_ddo(did).proof['creator']
-        return self._keeper.did_registry.get_did_owner(did_to_id(did))
+        return self._did_owners.get_owner(did)
+
+    def owner_many(self, dids):
+        """
+        Return the owners of a batch of assets, the ones not cached are read in JSON-RPC batch
+        requests.
+
+        :param dids: list of DID, str
+        :return: list of the ethereum addresses of the owners in the same order as `dids`
+        """
+        return self._did_owners.get_owners(dids)
 
     def owner_assets(self, owner_address):
         """
@@ -396,6 +771,10 @@ class OceanAssets:
         """
         # return [k for k, v in self._get_aquarius(self._aquarius_url).list_assets_ddo().items() if
         #         v['proof']['creator'] == owner_address]
+        if self._events_indexer and self._events_indexer.is_synced:
+            return [Web3Provider.get_web3().toBytes(hexstr=did) for did in
+                    self._events_indexer.storage.get_owner_dids(owner_address)]
+
         return self._keeper.did_registry.get_owner_asset_ids(owner_address)
 
     def consumer_assets(self, consumer_address):
@@ -405,6 +784,10 @@ class OceanAssets:
         :param consumer_address: ethereum address of consumer, hes-str
         :return: list of dids
         """
+        if self._events_indexer and self._events_indexer.is_synced:
+            return [Web3Provider.get_web3().toBytes(hexstr=did) for did in
+                    self._events_indexer.storage.get_consumer_dids(consumer_address)]
+
         return self._keeper.access_secret_store_condition.get_purchased_assets_by_address(
             consumer_address)
 
@@ -429,8 +812,29 @@ class OceanAssets:
         :return: true if the address has access permission to a DID
         """
         asset_id = add_0x_prefix(did_to_id(did))
+        if self._events_indexer and self._events_indexer.is_synced:
+            return self._events_indexer.storage.has_permission(asset_id.lower(), address)
+
         return self._keeper.did_registry.get_permission(asset_id, address)
 
+    def get_permissions_many(self, did, addresses):
+        """
+        Gets access permission of several grantees, read in JSON-RPC batch requests.
+
+        :param did: the id of an asset on-chain, hex str
+        :param addresses: list of ethereum account addresses, hex str
+        :return: list of bool in the same order as `addresses`
+        """
+        asset_id = add_0x_prefix(did_to_id(did))
+        if self._events_indexer and self._events_indexer.is_synced:
+            return [self._events_indexer.storage.has_permission(asset_id.lower(), address)
+                    for address in addresses]
+
+        batch = BatchCall()
+        for address in addresses:
+            batch.add(self._keeper.did_registry, 'getPermission', asset_id, address)
+        return batch.execute()
+
     def delegate_persmission(self, did, address_to_grant, account):
         """
         Grant access permission to an address.
@@ -453,8 +857,11 @@ class OceanAssets:
         :return: bool
         """
         asset_id = add_0x_prefix(did_to_id(did))
-        return self._keeper.did_registry.transfer_did_ownership(asset_id, new_owner_address,
-                                                                account)
+        try:
+            return self._keeper.did_registry.transfer_did_ownership(asset_id, new_owner_address,
+                                                                    account)
+        finally:
+            self._did_owners.invalidate(asset_id)
 
     def execute(self, agreement_id, did, index, consumer_account, workflow_did):
         """
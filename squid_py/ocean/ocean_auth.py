@@ -10,6 +10,7 @@ from ocean_keeper.web3_provider import Web3Provider
 
 from squid_py import ConfigProvider
 from squid_py.data_store.auth_tokens import AuthTokensStorage
+from squid_py.utils.ttl_cache import TTLCache
 
 
 class OceanAuth:
@@ -25,13 +26,24 @@ class OceanAuth:
 
     Token format is "signature-timestamp".
 
+    The addresses recovered from the checked tokens are cached until the tokens expire.
+
     """
     DEFAULT_EXPIRATION_TIME = 30 * 24 * 60 * 60  # in seconds
     DEFAULT_MESSAGE = "Ocean Protocol Authentication"
 
-    def __init__(self, keeper, storage_path):
+    def __init__(self, keeper, storage_path, tokens_cache_size=None):
+        """
+        :param keeper: Keeper instance
+        :param storage_path: str path of the auth tokens storage
+        :param tokens_cache_size: int maximum number of verified tokens kept in cache, defaults
+            to the `auth_token_cache.size` config option
+        """
         self._keeper = keeper
         self._tokens_storage = AuthTokensStorage(storage_path)
+        if tokens_cache_size is None:
+            tokens_cache_size = ConfigProvider.get_config().auth_token_cache_size
+        self._tokens_cache = TTLCache(tokens_cache_size)
 
     @staticmethod
     def _get_timestamp():
@@ -74,17 +86,34 @@ class OceanAuth:
         :param token: hex str consist of signature and timestamp
         :return: hex str ethereum address
         """
+        address = self._tokens_cache.get(token)
+        if address is not None:
+            return address
+
         parts = token.split('-')
         if len(parts) < 2:
             return '0x0'
 
         sig, timestamp = parts
-        if self._get_timestamp() > (int(timestamp) + self._get_expiration()):
+        now = self._get_timestamp()
+        expires_at = int(timestamp) + self._get_expiration()
+        if now > expires_at:
             return '0x0'
 
         message = self._get_message(timestamp)
         address = self._keeper.personal_ec_recover(Web3Provider.get_web3().sha3(text=message), sig)
-        return Web3Provider.get_web3().toChecksumAddress(address)
+        address = Web3Provider.get_web3().toChecksumAddress(address)
+        if expires_at > now:
+            self._tokens_cache.set(token, address, ttl=expires_at - now)
+        return address
+
+    def check_many(self, tokens):
+        """
+        :param tokens: list of hex str tokens, see `check`
+        :return: list of the hex str ethereum addresses of the tokens, in the same order
+        """
+        addresses = {token: self.check(token) for token in set(tokens)}
+        return [addresses[token] for token in tokens]
 
     def store(self, account):
         """
@@ -1,10 +1,14 @@
+from squid_py.utils.keys import to_index_key
+
+
 class OceanProviders:
     """Ocean assets class."""
 
-    def __init__(self, keeper, did_resolver, config):
+    def __init__(self, keeper, did_resolver, config, events_indexer=None):
         self._keeper = keeper
         self._did_resolver = did_resolver
         self._config = config
+        self._events_indexer = events_indexer
 
     def add(self, did, provider_address, account):
         return self._keeper.did_registry.add_provider(did, provider_address, account)
@@ -13,4 +17,9 @@ class OceanProviders:
         return self._keeper.did_registry.remove_provider(did, provider_address, account)
 
     def list(self, did):
+        if self._events_indexer and self._events_indexer.is_synced:
+            providers = self._events_indexer.storage.get_providers(to_index_key(did))
+            if providers is not None:
+                return providers
+
         return self._keeper.did_registry.get_did_providers(did)
@@ -4,6 +4,9 @@
 
 import logging
 
+from squid_py.utils.batch_call import BatchCall
+from squid_py.utils.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +17,41 @@ class OceanTemplates:
         self._keeper = keeper
         self._config = config
         self.access_template_id = self._keeper.escrow_access_secretstore_template.address
+        # TemplateStoreManager emits no event when a template is approved or revoked, the
+        # approval state is cached for a short time and dropped on local approve/revoke.
+        self._approved_cache = TTLCache(64, config.template_cache_ttl)
+
+    def is_approved(self, template_address):
+        """
+        True if the template is approved, the result is cached for `template_cache.ttl` seconds.
+
+        :param template_address: Address of the template contract, str
+        :return: bool
+        """
+        return self.is_approved_many([template_address])[0]
+
+    def is_approved_many(self, template_addresses):
+        """
+        Approval state of several templates, the ones not cached are read in one batch request.
+
+        :param template_addresses: list of addresses of template contracts, str
+        :return: list of bool in the same order as `template_addresses`
+        """
+        approved = {address: self._approved_cache.get(address) for address in template_addresses}
+        missing = [address for address, value in approved.items() if value is None]
+        if missing:
+            version = self._approved_cache.version
+            batch = BatchCall()
+            for address in missing:
+                batch.add(self._keeper.template_manager, 'isTemplateApproved', address)
+            for address, value in zip(missing, batch.execute()):
+                self._approved_cache.set(address, value, version)
+                approved[address] = value
+
+        return [approved[address] for address in template_addresses]
+
+    def _invalidate(self, template_address):
+        self._approved_cache.pop(template_address)
 
     def propose(self, template_address, account):
         """
@@ -71,6 +109,10 @@ class OceanTemplates:
                 return True
 
             return False
+        finally:
+            # Invalidated once the transaction is done, a state cached while it was pending is
+            # outdated.
+            self._invalidate(template_address)
 
     def revoke(self, template_address, account):
         """
@@ -92,3 +134,5 @@ class OceanTemplates:
 
             logger.warning(f'Only template admin or owner can revoke a template: {err}')
             return False
+        finally:
+            self._invalidate(template_address)
@@ -0,0 +1,126 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import logging
+
+from eth_abi import decode_abi
+from eth_utils import to_bytes, to_checksum_address
+from ocean_keeper.web3.request import make_post_request
+from ocean_keeper.web3_provider import Web3Provider
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCall:
+    """
+    Read only keeper contract calls sent together in JSON-RPC batch requests.
+
+       >> batch = BatchCall()
+       >> for did in dids:
+       >>     batch.add(keeper.did_registry, 'getDIDOwner', did)
+       >> owners = batch.execute()
+
+    The calls are sent one by one when the web3 provider is not an http provider.
+    """
+    MAX_BATCH_SIZE = 500
+
+    def __init__(self, web3=None):
+        """
+        :param web3: Web3 instance, defaults to the one of `Web3Provider`
+        """
+        self._web3 = web3 or Web3Provider.get_web3()
+        self._calls = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def add(self, contract, fn_name, *args):
+        """
+        Queue a call to a constant function of `contract`.
+
+        :param contract: ContractBase instance
+        :param fn_name: str name of the contract function
+        :param args: arguments of the contract function
+        :return: int index of the result of this call in the list returned by `execute`
+        """
+        fn_abi = self._get_function_abi(contract.contract.abi, fn_name, len(args))
+        self._calls.append((
+            contract.address,
+            contract.contract.encodeABI(fn_name=fn_name, args=list(args)),
+            [output['type'] for output in fn_abi['outputs']]
+        ))
+        return len(self._calls) - 1
+
+    def execute(self, block_identifier='latest'):
+        """
+        Send all the queued calls, `MAX_BATCH_SIZE` calls per request.
+
+        :param block_identifier: block number or 'latest'
+        :return: list of the results in the order the calls were added. As with the contract
+            wrappers, a function with a single output returns a value and a function with
+            several outputs returns a list.
+        """
+        calls, self._calls = self._calls, []
+        if isinstance(block_identifier, int):
+            block_identifier = hex(block_identifier)
+
+        results = []
+        for i in range(0, len(calls), self.MAX_BATCH_SIZE):
+            batch = calls[i:i + self.MAX_BATCH_SIZE]
+            for (_, _, output_types), value in zip(batch, self._call(batch, block_identifier)):
+                results.append(self._decode(output_types, value))
+        return results
+
+    def _call(self, calls, block_identifier):
+        provider = self._web3.providers[0]
+        endpoint_uri = getattr(provider, 'endpoint_uri', None)
+        if not endpoint_uri:
+            return [self._web3.eth.call({'to': to, 'data': data}, block_identifier)
+                    for to, data, _ in calls]
+
+        request = [
+            {
+                'jsonrpc': '2.0',
+                'method': 'eth_call',
+                'params': [{'to': to, 'data': data}, block_identifier],
+                'id': i
+            }
+            for i, (to, data, _) in enumerate(calls)
+        ]
+        logger.debug(f'Sending a batch of {len(request)} eth_call to {endpoint_uri}')
+        raw_response = make_post_request(
+            endpoint_uri,
+            json.dumps(request).encode('utf-8'),
+            **provider.get_request_kwargs()
+        )
+        responses = json.loads(raw_response)
+        if not isinstance(responses, list):
+            raise ValueError(f'Batch request to {endpoint_uri} failed: {responses}')
+
+        responses = {response.get('id'): response for response in responses}
+        results = []
+        for i in range(len(calls)):
+            response = responses.get(i)
+            if not response or 'error' in response:
+                raise ValueError(f'eth_call to {calls[i][0]} failed: '
+                                 f'{response.get("error") if response else "no response"}')
+            results.append(response['result'])
+        return results
+
+    @staticmethod
+    def _decode(output_types, value):
+        data = to_bytes(hexstr=value) if isinstance(value, str) else bytes(value)
+        decoded = [
+            to_checksum_address(item) if output_type == 'address' else item
+            for output_type, item in zip(output_types, decode_abi(output_types, data))
+        ]
+        return decoded[0] if len(decoded) == 1 else decoded
+
+    @staticmethod
+    def _get_function_abi(abi, fn_name, num_args):
+        for item in abi:
+            if (item.get('type') == 'function' and item.get('name') == fn_name
+                    and len(item.get('inputs', [])) == num_args):
+                return item
+
+        raise ValueError(f'Function {fn_name} with {num_args} arguments not found in the abi.')
@@ -0,0 +1,18 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+from eth_utils import add_0x_prefix
+from ocean_utils.did import OCEAN_PREFIX, did_to_id
+
+
+def to_index_key(value):
+    """
+    Key of a DID, asset id or agreement id in the local indexes and caches.
+
+    :param value: DID str, hex str or bytes
+    :return: lowercase hex str with the 0x prefix
+    """
+    if isinstance(value, str):
+        if value.startswith(OCEAN_PREFIX):
+            value = did_to_id(value)
+        return add_0x_prefix(value).lower()
+    return '0x' + bytes(value).hex()
@@ -0,0 +1,41 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread safe token bucket limiting the rate of an amount shared by several threads, such as
+    the bytes downloaded by concurrent downloads.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: float amount allowed per second
+        :param burst: float amount that can be consumed at once after an idle period, defaults
+            to one second of `rate`
+        """
+        self._rate = float(rate)
+        self._burst = float(burst or rate)
+        self._available = self._burst
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        """
+        Wait until `amount` can be consumed without exceeding the rate.
+
+        :param amount: float amount consumed
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(
+                self._burst, self._available + (now - self._last_update) * self._rate)
+            self._last_update = now
+            # The amount is consumed immediately, the callers queue up behind the debt.
+            self._available -= amount
+            wait = -self._available / self._rate if self._available < 0 else 0
+
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,64 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import math
+import threading
+import time
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel with a resolution of `tick` seconds.
+
+    Scheduling an item and advancing the wheel by one tick are constant time, whatever the
+    number of scheduled items. Items are never expired before their timeout, and at most one
+    tick late.
+    """
+
+    def __init__(self, tick=1.0, size=512):
+        """
+        :param tick: float duration of one tick in seconds
+        :param size: int number of slots of the wheel
+        """
+        self._tick = tick
+        self._slots = [[] for _ in range(size)]
+        self._position = 0
+        self._last_tick = time.monotonic()
+        self._lock = threading.Lock()
+
+    def schedule(self, timeout, item, now=None):
+        """
+        :param timeout: float seconds after which `item` expires
+        :param item: any, returned by `advance` once expired
+        :param now: float `time.monotonic` value, defaults to the current one
+        """
+        now = time.monotonic() if now is None else now
+        size = len(self._slots)
+        with self._lock:
+            # Ticks are counted from the last one, the time elapsed since is part of the timeout.
+            ticks = max(1, int(math.ceil((now + timeout - self._last_tick) / self._tick)))
+            # The slot is first visited after ((ticks - 1) % size) + 1 ticks, then once per turn.
+            self._slots[(self._position + ticks) % size].append([(ticks - 1) // size, item])
+
+    def advance(self, now=None):
+        """
+        Move the wheel forward to the current time.
+
+        :param now: float `time.monotonic` value, defaults to the current one
+        :return: list of the expired items
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            while now - self._last_tick >= self._tick:
+                self._last_tick += self._tick
+                self._position = (self._position + 1) % len(self._slots)
+                remaining = []
+                for entry in self._slots[self._position]:
+                    if entry[0] == 0:
+                        expired.append(entry[1])
+                    else:
+                        entry[0] -= 1
+                        remaining.append(entry)
+                self._slots[self._position] = remaining
+
+        return expired
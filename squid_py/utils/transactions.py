@@ -0,0 +1,75 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import logging
+import threading
+
+from ocean_keeper.wallet import Wallet
+from ocean_keeper.web3_provider import Web3Provider
+
+logger = logging.getLogger(__name__)
+
+_account_locks = {}
+_account_locks_lock = threading.Lock()
+
+
+def account_lock(address):
+    """
+    Lock serialising the transactions of an account sent from several threads.
+
+    `Wallet` assigns the nonces of the accounts with a local key without synchronisation, so
+    two transactions of one account signed concurrently can get the same nonce. The
+    transactions of the agreements callbacks and of `send_transaction` are sent holding
+    this lock.
+
+    :param address: hex str ethereum address of the account
+    :return: threading.RLock
+    """
+    with _account_locks_lock:
+        return _account_locks.setdefault(address.lower(), threading.RLock())
+
+
+def send_transaction(contract, fn_name, fn_args, account):
+    """
+    Send a transaction of `account` without waiting for its receipt.
+
+    The gas is estimated before the transaction is signed, so a transaction that would revert
+    fails without using a nonce of the account. The transaction is then signed and sent
+    holding the `account_lock` of the account. When sending fails, the nonce held by the
+    `Wallet` is synced with the pending transactions count of the network, so the next
+    transactions of a batch neither reuse a pending nonce nor leave a gap.
+
+    :param contract: ContractBase instance
+    :param fn_name: str the smart contract function name
+    :param fn_args: tuple arguments of the function
+    :param account: Account instance sending the transaction
+    :return: hex str transaction hash
+    """
+    gas = getattr(contract.contract.functions, fn_name)(*fn_args).estimateGas(
+        {'from': account.address})
+    with account_lock(account.address):
+        try:
+            return contract.send_transaction(
+                fn_name,
+                fn_args,
+                transact={'from': account.address,
+                          'passphrase': account.password,
+                          'account_key': account.key,
+                          'gas': gas}
+            )
+        except Exception:
+            if account.key:
+                _sync_wallet_nonce(account.address)
+            raise
+
+
+def _sync_wallet_nonce(address):
+    web3 = Web3Provider.get_web3()
+    address = web3.toChecksumAddress(address)
+    pending_count = web3.eth.getTransactionCount(address, 'pending')
+    logger.debug(f'Syncing the nonce of {address} with its pending transactions count '
+                 f'{pending_count}.')
+    # `Wallet` signs the next transaction with the count it holds plus one.
+    if pending_count:
+        Wallet._last_tx_count[address] = pending_count - 1
+    else:
+        Wallet._last_tx_count.pop(address, None)
@@ -0,0 +1,107 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread safe LRU cache with a time to live on its entries.
+
+    The least recently used entry is evicted once `max_size` entries are stored and
+    entries older than `ttl` seconds are dropped when they are looked up.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        """
+        :param max_size: int maximum number of entries, 0 disables the cache
+        :param ttl: float time to live of the entries in seconds, None for no expiry
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self):
+        """Counter incremented on every invalidation, see `set`."""
+        return self._version
+
+    def get(self, key, default=None):
+        """
+        :param key: hashable
+        :param default: value returned if `key` is not cached or expired
+        :return: cached value or `default`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                del self._entries[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value, version=None, ttl=None):
+        """
+        Store `value` under `key`.
+
+        :param key: hashable
+        :param value: any
+        :param version: the cache `version` read before fetching `value`. If any entry was
+            invalidated since then `value` might be stale and it is not stored.
+        :param ttl: float time to live of this entry in seconds, defaults to the cache ttl.
+            An entry with a ttl of 0 or less is already expired and it is not stored.
+        """
+        if not self._max_size:
+            return
+
+        if ttl is None:
+            ttl = self._ttl
+        elif ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """
+        Invalidate the entry stored under `key`.
+
+        :param key: hashable
+        :return: the cached value or None
+        """
+        with self._lock:
+            self._version += 1
+            entry = self._entries.pop(key, None)
+            return entry[0] if entry else None
+
+    def clear(self):
+        """Invalidate all entries."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self):
+        """
+        :return: dict with the `hits`, `misses` and current `size` of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,27 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+import json
+
+from ocean_utils.agreements.service_types import ServiceTypes
+from ocean_utils.ddo.ddo import DDO
+
+from squid_py.assets.asset_record import AssetRecord
+from tests.resources.helper_functions import get_resource_path
+
+
+def test_asset_record():
+    with open(get_resource_path('ddo', 'ddo_sa_sample.json')) as f:
+        ddo_dict = json.load(f)
+
+    record = AssetRecord(ddo_dict)
+    assert record.did == ddo_dict['id']
+    assert record.name == 'UK Weather information 2011'
+    assert record.price == ddo_dict['service'][0]['attributes']['main']['price']
+    assert record._ddo is None
+
+    ddo = DDO(dictionary=ddo_dict)
+    assert record.metadata == ddo.metadata
+    assert isinstance(record.ddo, DDO)
+    assert record.get_service(ServiceTypes.ASSET_ACCESS).as_dictionary() == \
+        ddo.get_service(ServiceTypes.ASSET_ACCESS).as_dictionary()
+    assert record.as_dictionary() == ddo.as_dictionary()
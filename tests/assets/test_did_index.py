@@ -0,0 +1,27 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from ocean_utils.did import DID
+
+from squid_py.assets.did_index import DIDIndex
+
+
+def test_did_index():
+    did_index = DIDIndex(100)
+    dids = [DID.did({'seed': i}) for i in range(10)]
+    did_index.update(dids[:5])
+    assert len(did_index) == 5
+    assert all(did in did_index for did in dids[:5])
+    assert not any(did in did_index for did in dids[5:])
+
+    did_index.add(dids[5].upper().replace('DID:OP:', 'did:op:'))
+    assert dids[5] in did_index
+
+
+def test_did_index_capacity():
+    did_index = DIDIndex(3)
+    dids = [DID.did({'seed': i}) for i in range(5)]
+    did_index.update(dids)
+    assert len(did_index) == 3
+    assert all(did in did_index for did in dids[:3])
+    assert not any(did in did_index for did in dids[3:])
@@ -0,0 +1,260 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import os
+import threading
+
+import pytest
+from ocean_utils.exceptions import OceanServiceConsumeError
+
+from squid_py.brizo.brizo import Brizo, DownloadError, DownloadVerificationError, StreamedFile
+from tests.resources.helper_functions import get_consumer_account
+
+
+class _Response:
+    def __init__(self, status_code, content, file_name=None, url=None, headers=None):
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 300 else 'Not Found'
+        self.url = url
+        self.headers = dict(headers or {})
+        if file_name:
+            self.headers['content-disposition'] = f'attachment;filename={file_name}'
+        self._chunks = content if isinstance(content, list) else [content]
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self._chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class _HttpClient:
+    def __init__(self, concurrency=1):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        # The first `concurrency` requests are answered once they are all in progress.
+        self._barrier = threading.Barrier(concurrency)
+        self._num_requests = 0
+
+    def get(self, url, stream=False, headers=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self._num_requests += 1
+            wait = self._num_requests <= self._barrier.parties
+        try:
+            if wait:
+                self._barrier.wait(timeout=10)
+            file_url = url.split('?url=')[1].split('&')[0]
+            if file_url.endswith('missing'):
+                return _Response(404, b'')
+            return _Response(200, file_url.encode(), os.path.basename(file_url))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_consume_service_concurrent_downloads(tmpdir):
+    http_client = _HttpClient(concurrency=3)
+    default_client = Brizo._http_client
+    Brizo.set_http_client(http_client)
+    try:
+        files = [{'url': f'http://localhost/file{i}'} for i in range(4)]
+        files.append({'url': 'http://localhost/missing'})
+        with pytest.raises(DownloadError) as error:
+            Brizo.consume_service(
+                '0x' + '01' * 32, 'http://localhost:8030', get_consumer_account(), files,
+                str(tmpdir), max_workers=3, max_bytes_per_second=0, chunk_size=1024)
+    finally:
+        Brizo.set_http_client(default_client)
+
+    results = error.value.results
+    assert http_client.max_active == 3
+    assert [r.index for r in results] == list(range(5))
+    for i, result in enumerate(results[:4]):
+        assert result.error is None
+        assert result.path == os.path.join(str(tmpdir), f'file{i}')
+        with open(result.path) as f:
+            assert f.read() == files[i]['url']
+    assert results[4].path is None
+    assert isinstance(results[4].error, OceanServiceConsumeError)
+
+
+def test_consume_service_verification_errors(tmpdir):
+    default_client = Brizo._http_client
+    Brizo.set_http_client(_HttpClient())
+    try:
+        files = [{'url': f'http://localhost/file{i}'} for i in range(3)]
+        files_metadata = [
+            {'contentLength': str(len(files[0]['url']))},
+            {'checksum': hashlib.md5(b'other content').hexdigest()},
+            {}
+        ]
+        with pytest.raises(DownloadError) as error:
+            Brizo.consume_service(
+                '0x' + '01' * 32, 'http://localhost:8030', get_consumer_account(), files,
+                str(tmpdir), max_workers=1, max_bytes_per_second=0, chunk_size=1024,
+                files_metadata=files_metadata)
+    finally:
+        Brizo.set_http_client(default_client)
+
+    results = error.value.results
+    assert [result.verified for result in results] == [True, False, None]
+    assert isinstance(results[1].error, DownloadVerificationError)
+    assert results[1].path is None
+    assert not os.path.exists(os.path.join(str(tmpdir), 'file1'))
+    assert Brizo._get_integrity_info({'contentLength': '0'}) == (0, None)
+
+
+class _FlakyHttpClient:
+    CONTENT = b'0123456789'
+    ETAG = '"v1"'
+
+    def __init__(self):
+        self.ranges = []
+
+    def get(self, url, stream=False, headers=None):
+        headers = headers or {}
+        self.ranges.append(headers.get('Range'))
+        if 'Range' in headers and headers.get('If-Range') == self.ETAG:
+            start = int(headers['Range'][len('bytes='):-1])
+            return _Response(206, self.CONTENT[start:], url=url, headers={
+                'content-range': f'bytes {start}-9/10', 'content-length': str(10 - start),
+                'etag': self.ETAG})
+        # The connection drops after the first half of the file.
+        return _Response(200, [self.CONTENT[:5], ConnectionError('connection reset')],
+                         file_name='data', url=url,
+                         headers={'accept-ranges': 'bytes', 'content-length': '10',
+                                  'etag': self.ETAG})
+
+
+def test_write_file_resumes_downloads(tmpdir):
+    http_client = _FlakyHttpClient()
+    default_client = Brizo._http_client
+    Brizo.set_http_client(http_client)
+    try:
+        url = 'http://localhost/data'
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'data')
+        assert http_client.ranges == [None, 'bytes=5-']
+        with open(path, 'rb') as f:
+            assert f.read() == http_client.CONTENT
+        assert not os.path.exists(path + '.part')
+        assert not os.path.exists(path + '.part.validator')
+
+        # A part file left by a previous run is resumed if the content did not change.
+        part_path = os.path.join(str(tmpdir), 'other.1.part')
+        with open(part_path, 'wb') as f:
+            f.write(http_client.CONTENT[:3])
+        with open(part_path + '.validator', 'w') as f:
+            f.write(http_client.ETAG)
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'other', index=1)
+        assert http_client.ranges[2:] == [None, 'bytes=3-']
+        with open(path, 'rb') as f:
+            assert f.read() == http_client.CONTENT
+
+        # Otherwise, it is downloaded again from the start.
+        with open(part_path, 'wb') as f:
+            f.write(b'abc')
+        with open(part_path + '.validator', 'w') as f:
+            f.write('"v0"')
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'other', index=1)
+        assert http_client.ranges[4:] == [None, 'bytes=5-']
+        with open(path, 'rb') as f:
+            assert f.read() == http_client.CONTENT
+        assert not os.path.exists(part_path + '.validator')
+    finally:
+        Brizo.set_http_client(default_client)
+
+
+def test_write_file_verifies_metadata(tmpdir):
+    http_client = _FlakyHttpClient()
+    default_client = Brizo._http_client
+    Brizo.set_http_client(http_client)
+    url = 'http://localhost/data'
+    content = http_client.CONTENT
+    try:
+        # The checksum covers the bytes of both the interrupted and the resumed requests.
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'data', file_metadata={
+            'contentLength': '10', 'checksum': hashlib.md5(content).hexdigest()})
+        with open(path, 'rb') as f:
+            assert f.read() == content
+
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'sha', file_metadata={
+            'checksum': 'sha256:' + hashlib.sha256(content).hexdigest().upper()})
+        assert os.path.exists(path)
+
+        with pytest.raises(DownloadVerificationError):
+            Brizo.write_file(http_client.get(url), str(tmpdir), 'corrupted', file_metadata={
+                'checksum': hashlib.md5(b'other content').hexdigest()})
+        with pytest.raises(DownloadVerificationError):
+            Brizo.write_file(http_client.get(url), str(tmpdir), 'longer', file_metadata={
+                'contentLength': 8})
+        for name in ('corrupted', 'longer'):
+            assert not os.path.exists(os.path.join(str(tmpdir), name))
+            assert not os.path.exists(os.path.join(str(tmpdir), name + '.part'))
+
+        # Unknown checksums are not verified.
+        path = Brizo.write_file(http_client.get(url), str(tmpdir), 'unknown', file_metadata={
+            'checksum': 'abc', 'contentLength': 'unknown'})
+        assert os.path.exists(path)
+    finally:
+        Brizo.set_http_client(default_client)
+
+
+class _ChunkedResponse(_Response):
+    def __init__(self, content):
+        _Response.__init__(self, 200, content, headers={'content-length': str(len(content))})
+        self.chunk_sizes = []
+
+    def iter_content(self, chunk_size=None):
+        content = b''.join(self._chunks)
+        for i in range(0, len(content), chunk_size):
+            self.chunk_sizes.append(len(content[i:i + chunk_size]))
+            yield content[i:i + chunk_size]
+
+
+def test_write_file_chunk_size(tmpdir):
+    content = bytes(range(256)) * 4
+    response = _ChunkedResponse(content)
+    path = Brizo.write_file(response, str(tmpdir), 'data', chunk_size=100)
+    assert response.chunk_sizes == [100] * 10 + [24]
+    with open(path, 'rb') as f:
+        assert f.read() == content
+
+
+def test_consume_stream(tmpdir):
+    http_client = _HttpClient()
+    default_client = Brizo._http_client
+    Brizo.set_http_client(http_client)
+    try:
+        files = [{'url': f'http://localhost/file{i}'} for i in range(3)]
+        files_metadata = [{'index': i, 'contentLength': str(len(f['url']))}
+                          for i, f in enumerate(files)]
+        stream = Brizo.consume_stream(
+            '0x' + '01' * 32, 'http://localhost:8030', get_consumer_account(), files,
+            files_metadata=files_metadata, chunk_size=1024)
+        for i, streamed in enumerate(stream):
+            assert streamed == StreamedFile(i, f'file{i}', streamed.chunks)
+            assert b''.join(streamed.chunks) == files[i]['url'].encode()
+        assert not os.listdir(str(tmpdir))
+
+        files_metadata[1]['checksum'] = hashlib.md5(b'other content').hexdigest()
+        stream = Brizo.consume_stream(
+            '0x' + '01' * 32, 'http://localhost:8030', get_consumer_account(), files,
+            files_metadata=files_metadata, chunk_size=1024)
+        assert b''.join(next(stream).chunks) == files[0]['url'].encode()
+        with pytest.raises(DownloadVerificationError):
+            b''.join(next(stream).chunks)
+
+        files.append({'url': 'http://localhost/missing'})
+        with pytest.raises(OceanServiceConsumeError):
+            list(Brizo.consume_stream(
+                '0x' + '01' * 32, 'http://localhost:8030', get_consumer_account(), files,
+                chunk_size=1024))
+    finally:
+        Brizo.set_http_client(default_client)
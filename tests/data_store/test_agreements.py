@@ -0,0 +1,32 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from squid_py.data_store.agreements import AgreementStates, AgreementsStorage
+
+DID = 'did:op:' + '0a' * 32
+PUBLISHER = '0x00Bd138aBD70e2F00903268F3Db08f2D25677C9e'
+CONSUMER = '0x068Ed00cF0441e4829D9784fCBe7b9e26D4BD8d0'
+CONDITION_IDS = ['0x' + '01' * 32, '0x' + '02' * 32, '0x' + '03' * 32]
+
+
+def test_agreements_storage():
+    storage = AgreementsStorage(':memory:')
+    storage.record_agreement('0x01', DID, 'access', CONSUMER, PUBLISHER, CONDITION_IDS, False, 10)
+    storage.record_agreement('0x02', DID, 'access', CONSUMER, PUBLISHER, CONDITION_IDS, True, 5)
+    assert storage.get_agreement('0x03') is None
+
+    record = storage.get_agreement('0x01')
+    assert record.status == AgreementStates.CREATED
+    assert record.condition_ids == CONDITION_IDS
+    assert record.auto_consume is False
+    assert [r.agreement_id for r in storage.get_pending_agreements(CONSUMER)] == ['0x02', '0x01']
+
+    storage.update_status('0x01', AgreementStates.REWARD_LOCKED, 12)
+    storage.update_status('0x02', AgreementStates.REWARD_LOCKED, 11)
+    assert storage.get_agreement('0x01').block_number == 12
+    # Only the auto consumed agreement is still waiting for the access condition.
+    assert [r.agreement_id for r in storage.get_pending_agreements(CONSUMER)] == ['0x02']
+
+    storage.update_status('0x02', AgreementStates.CONSUMED)
+    assert storage.get_agreement('0x02').block_number == 11
+    assert storage.get_pending_agreements(CONSUMER) == []
@@ -0,0 +1,34 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import threading
+
+from squid_py.data_store.auth_tokens import AuthTokensStorage
+
+ADDRESSES = ['0x00Bd138aBD70e2F00903268F3Db08f2D25677C9e',
+             '0x068Ed00cF0441e4829D9784fCBe7b9e26D4BD8d0']
+
+
+def test_auth_tokens_storage_many(tmpdir):
+    storage = AuthTokensStorage(str(tmpdir.join('tokens.db')))
+    storage.write_tokens_many([(ADDRESSES[0], '0x01-10', '10'), (ADDRESSES[1], '0x02-20', '20')])
+    assert storage.read_token(ADDRESSES[0]) == ('0x01-10', '10')
+    assert storage.read_tokens_many(ADDRESSES + ['0x0']) == {
+        ADDRESSES[0]: ('0x01-10', '10'),
+        ADDRESSES[1]: ('0x02-20', '20')
+    }
+
+    # Each thread uses its own connection.
+    thread = threading.Thread(target=storage.update_token, args=(ADDRESSES[1], '0x03-30', '30'))
+    thread.start()
+    thread.join()
+    assert storage.read_token(ADDRESSES[1]) == ('0x03-30', '30')
+
+
+def test_auth_tokens_storage_in_memory():
+    storage = AuthTokensStorage(':memory:')
+    assert storage.read_token(ADDRESSES[0]) == (None, None)
+    thread = threading.Thread(target=storage.write_token, args=(ADDRESSES[0], '0x01-10', '10'))
+    thread.start()
+    thread.join()
+    assert storage.read_tokens_many(ADDRESSES) == {ADDRESSES[0]: ('0x01-10', '10')}
@@ -0,0 +1,36 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from squid_py.data_store.events_index import EventsIndexStorage
+from squid_py.utils.keys import to_index_key
+
+DID = 'did:op:' + '0a' * 32
+OWNER = '0x00Bd138aBD70e2F00903268F3Db08f2D25677C9e'
+CONSUMER = '0x068Ed00cF0441e4829D9784fCBe7b9e26D4BD8d0'
+
+
+def test_events_index_storage():
+    storage = EventsIndexStorage(':memory:')
+    did = to_index_key(DID)
+    assert storage.get_checkpoint('test') is None
+    assert storage.get_providers(did) is None
+
+    storage.write_events(
+        'test', 10,
+        registrations=[(did, OWNER.lower(), 5)],
+        providers={did: [OWNER]},
+        permissions=[(did, CONSUMER.lower(), True)],
+        purchases=[('0x01', did, CONSUMER.lower(), 7)]
+    )
+    assert storage.get_checkpoint('test') == 10
+    assert storage.get_owner_dids(OWNER) == [did]
+    assert storage.get_consumer_dids(CONSUMER) == [did]
+    assert storage.get_providers(did) == [OWNER]
+    assert storage.has_permission(did, CONSUMER)
+
+    storage.write_events('test', 20, providers={did: []},
+                         permissions=[(did, CONSUMER.lower(), False)])
+    assert storage.get_checkpoint('test') == 20
+    assert storage.get_providers(did) == []
+    assert not storage.has_permission(did, CONSUMER)
+    assert storage.get_owner_dids(CONSUMER) == []
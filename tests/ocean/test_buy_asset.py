@@ -80,6 +80,8 @@ def test_buy_asset(consumer_ocean_instance, publisher_ocean_instance):
     )
     assert event, 'no event for AccessSecretStoreCondition.Fulfilled'
     assert cons_ocn.agreements.is_access_granted(agreement_id, ddo.did, consumer_account.address)
+    assert cons_ocn.agreements.wait_for_access(
+        agreement_id, ddo.did, consumer_account.address, event_wait_time)
 
     assert cons_ocn.assets.consume(
         agreement_id,
@@ -13,9 +13,11 @@ from squid_py import ConfigProvider
 from squid_py.assets.asset_consumer import AssetConsumer
 from squid_py.assets.asset_executor import AssetExecutor
 from squid_py.brizo.brizo import Brizo
+from squid_py.data_store.agreements import AgreementStates, AgreementsStorage
 from squid_py.ocean.keeper import SquidKeeper as Keeper
 from squid_py.ocean.ocean_agreements import OceanAgreements
-from tests.resources.helper_functions import (get_ddo_sample, log_event)
+from tests.resources.helper_functions import (get_consumer_account, get_ddo_sample,
+                                              get_publisher_account, log_event)
 from tests.resources.mocks.brizo_mock import BrizoMock
 from tests.resources.tiers import e2e_test
 
@@ -51,6 +53,60 @@ def test_prepare_agreement(ocean_agreements):
     pass
 
 
+def test_agreement_values_cache(ocean_agreements):
+    keeper = Keeper.get_instance()
+    ddo = get_ddo_sample()
+    service_agreement = ServiceAgreement.from_ddo(ServiceTypes.ASSET_ACCESS, ddo)
+    agreement_id = ocean_agreements.new()
+    consumer = '0x068Ed00cF0441e4829D9784fCBe7b9e26D4BD8d0'
+    publisher = '0x00Bd138aBD70e2F00903268F3Db08f2D25677C9e'
+
+    args = (agreement_id, ddo.asset_id, consumer, publisher)
+    condition_ids, agreement_hash = ocean_agreements._get_agreement_values(
+        service_agreement, *args)
+    assert condition_ids == service_agreement.generate_agreement_condition_ids(*args, keeper)
+    assert agreement_hash == service_agreement.get_service_agreement_hash(*args, keeper)
+
+    assert ocean_agreements._get_agreement_values(
+        service_agreement, agreement_id, ddo.asset_id, consumer.lower(), publisher
+    ) == (condition_ids, agreement_hash)
+    assert ocean_agreements._agreement_values_cache.hits == 1
+
+
+def test_resume_agreements(tmpdir):
+    keeper = Keeper.get_instance()
+    ddo = get_ddo_sample()
+    did_resolver = Mock()
+    did_resolver.resolve = MagicMock(return_value=ddo)
+    consumer = get_consumer_account()
+    agreement_id = OceanAgreements.new()
+    condition_ids = ['0x' + '01' * 32, '0x' + '02' * 32, '0x' + '03' * 32]
+    storage = AgreementsStorage(str(tmpdir.join('agreements.db')))
+    storage.record_agreement(agreement_id, ddo.did, ServiceTypes.ASSET_ACCESS, consumer.address,
+                             get_publisher_account().address, condition_ids, True, 10)
+    storage.update_status(agreement_id, AgreementStates.REWARD_LOCKED, 12)
+
+    # A new client, e.g. after a restart, resumes the agreement from its stored state.
+    event_dispatcher = Mock()
+    ocean_agreements = OceanAgreements(
+        keeper,
+        did_resolver,
+        AssetConsumer,
+        AssetExecutor,
+        ConfigProvider.get_config(),
+        agreements_storage=AgreementsStorage(str(tmpdir.join('agreements.db'))),
+        event_dispatcher=event_dispatcher
+    )
+    assert ocean_agreements.resume(consumer) == [agreement_id]
+    # The reward is locked already, only the access condition is waited for, from the block
+    # of the last event processed.
+    event_dispatcher.subscribe.assert_called_once()
+    args, kwargs = event_dispatcher.subscribe.call_args
+    assert args[0] == keeper.access_secret_store_condition
+    assert args[2] == agreement_id
+    assert kwargs['from_block'] == 12
+
+
 def test_send_agreement(ocean_agreements):
     pass
 
@@ -107,6 +163,8 @@ def test_agreement_status(setup_agreements_enviroment, ocean_agreements):
                                                                     "escrowReward": 1
                                                                     }
                                                      }
+    assert ocean_agreements.status_many([agreement_id, agreement_id]) == [
+        (agreement_id, {"lockReward": 1, "accessSecretStore": 1, "escrowReward": 1})] * 2
     # keeper.dispenser.request_vodkas(price, consumer_acc)
 
     # keeper.token.token_approve(keeper.lock_reward_condition.address, price, consumer_acc)
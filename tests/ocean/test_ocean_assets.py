@@ -1,7 +1,9 @@
 #  Copyright 2018 Ocean Protocol Foundation
 #  SPDX-License-Identifier: Apache-2.0
 
+import copy
 import logging
+import time
 
 import pytest
 from ocean_keeper.exceptions import OceanDIDNotFound
@@ -13,6 +15,10 @@ from ocean_utils.aquarius import AquariusProvider
 from ocean_utils.ddo.ddo import DDO
 from ocean_utils.did import DID
 
+from squid_py.data_store.agreements import AgreementStates
+from squid_py.data_store.events_index import EventsIndexStorage
+from squid_py.events.events_indexer import EventsIndexer
+from squid_py.utils.ttl_cache import TTLCache
 from tests.resources.helper_functions import (get_algorithm_ddo, get_computing_metadata,
                                               get_resource_path, log_event)
 from tests.resources.tiers import e2e_test
@@ -276,6 +282,40 @@ def test_ocean_assets_search(publisher_ocean_instance, metadata):
     publisher_ocean_instance.assets.retire(ddo.did)
 
 
+def test_ocean_assets_iter_search(publisher_ocean_instance, metadata):
+    publisher = publisher_ocean_instance.main_account
+    ddo = publisher_ocean_instance.assets.create(metadata, publisher)
+    dids = [_ddo.did for _ddo in publisher_ocean_instance.assets.iter_search('Monkey', offset=2)]
+    assert ddo.did in dids
+    assert len(dids) == len(set(dids))
+
+    query = {'query': {'text': ['Monkey']}}
+    dids = [_ddo.did for _ddo in publisher_ocean_instance.assets.iter_query(query, offset=2)]
+    assert ddo.did in dids
+    assert query == {'query': {'text': ['Monkey']}}
+    publisher_ocean_instance.assets.retire(ddo.did)
+
+
+def test_ocean_assets_search_cache(publisher_ocean_instance, metadata):
+    assets = publisher_ocean_instance.assets
+    publisher = publisher_ocean_instance.main_account
+    search_cache = assets._search_cache
+    assets._search_cache = TTLCache(10, 60)
+    try:
+        ddo = assets.create(metadata, publisher)
+        query = {'query': {'text': ['Monkey']}}
+        results = assets.query(query)
+        assert ddo.did in [_ddo.did for _ddo in results]
+        assert [_ddo.did for _ddo in assets.query(query)] == [_ddo.did for _ddo in results]
+        assert assets._search_cache.hits == 1
+
+        assets.retire(ddo.did)
+        assert len(assets._search_cache) == 0
+        assert ddo.did not in [_ddo.did for _ddo in assets.query(query)]
+    finally:
+        assets._search_cache = search_cache
+
+
 def test_ocean_assets_validate(publisher_ocean_instance, metadata):
     assert publisher_ocean_instance.assets.validate(metadata)
 
@@ -316,6 +356,9 @@ def test_ocean_transfer_ownership(publisher_ocean_instance, metadata, consumer_o
     ddo = publisher_ocean_instance.assets.create(metadata, publisher)
     owner = publisher_ocean_instance.assets.owner(ddo.did)
     assert owner == publisher.address
+    hits = publisher_ocean_instance._did_owners.cache_stats()['hits']
+    assert publisher_ocean_instance.assets.owner(ddo.did) == owner
+    assert publisher_ocean_instance._did_owners.cache_stats()['hits'] == hits + 1
     publisher_ocean_instance.assets.transfer_ownership(ddo.did, consumer.address, publisher)
     assert publisher_ocean_instance.assets.owner(ddo.did) == consumer.address
     publisher_ocean_instance.assets.retire(ddo.did)
@@ -332,6 +375,21 @@ def test_ocean_grant_permissions(publisher_ocean_instance, metadata, consumer_oc
     assert not publisher_ocean_instance.assets.get_permissions(ddo.did, consumer.address)
 
 
+def test_ocean_assets_batch_reads(publisher_ocean_instance, metadata, consumer_ocean_instance):
+    assets = publisher_ocean_instance.assets
+    publisher = publisher_ocean_instance.main_account
+    consumer = consumer_ocean_instance.main_account
+    ddo = assets.create(metadata, publisher)
+    other_ddo = assets.create(metadata, publisher)
+    assets.transfer_ownership(other_ddo.did, consumer.address, publisher)
+    assert assets.owner_many([ddo.did, other_ddo.did]) == [publisher.address, consumer.address]
+
+    assets.delegate_persmission(ddo.did, consumer.address, publisher)
+    assert assets.get_permissions_many(ddo.did, [publisher.address, consumer.address]) == [
+        assets.get_permissions(ddo.did, publisher.address), True]
+    assets.retire(ddo.did)
+
+
 # def test_ocean_execute_workflow(publisher_ocean_instance, consumer_ocean_instance):
 #     publisher = publisher_ocean_instance.main_account
 #     consumer = consumer_ocean_instance.main_account
@@ -361,3 +419,113 @@ def test_ocean_grant_permissions(publisher_ocean_instance, metadata, consumer_oc
 #         print(f'Compute job started successfully, job id is {job_id}')
 #     except Exception as e:
 #         print(f'Executing the compute job for agreementId {agreement_id} failed: {e}')
+
+
+def test_ocean_assets_create_many(publisher_ocean_instance, metadata):
+    publisher = publisher_ocean_instance.main_account
+    metadata_list = []
+    for i in range(3):
+        _metadata = copy.deepcopy(metadata)
+        _metadata['main']['name'] = f'{metadata["main"]["name"]} {i}'
+        metadata_list.append(_metadata)
+
+    results = publisher_ocean_instance.assets.create_many(metadata_list, publisher, max_workers=2)
+    assert len(results) == len(metadata_list)
+    for result, _metadata in zip(results, metadata_list):
+        assert result.error is None, f'publishing asset failed: {result.error}'
+        assert result.ddo.did == result.did
+        assert result.ddo.metadata['main']['name'] == _metadata['main']['name']
+        assert publisher_ocean_instance.assets.resolve(result.did).did == result.did
+        publisher_ocean_instance.assets.retire(result.did)
+
+
+def test_ocean_assets_resolve_cache(publisher_ocean_instance, metadata):
+    publisher = publisher_ocean_instance.main_account
+    ddo = publisher_ocean_instance.assets.create(metadata, publisher)
+    did_resolver = publisher_ocean_instance.did_resolver
+    hits, misses = did_resolver.hits, did_resolver.misses
+    assert publisher_ocean_instance.assets.resolve(ddo.did).did == ddo.did
+    resolved = publisher_ocean_instance.assets.resolve(ddo.did)
+    assert resolved.did == ddo.did
+    assert did_resolver.misses == misses + 1
+    assert did_resolver.hits == hits + 1
+
+    # Modifying a resolved DDO does not change the cached one.
+    num_services = len(resolved.services)
+    resolved.add_service('Test', 'http://localhost/test', values={})
+    assert len(publisher_ocean_instance.assets.resolve(ddo.did).services) == num_services
+
+    publisher_ocean_instance.assets.retire(ddo.did)
+    misses = did_resolver.misses
+    try:
+        publisher_ocean_instance.assets.resolve(ddo.did)
+    except ValueError:
+        pass
+    assert did_resolver.misses == misses + 1
+
+
+def test_ocean_assets_resolve_many(publisher_ocean_instance, metadata):
+    publisher = publisher_ocean_instance.main_account
+    ddo = publisher_ocean_instance.assets.create(metadata, publisher)
+    unknown_did = DID.did({'0': '0x9876543210'})
+    results = publisher_ocean_instance.assets.resolve_many([ddo.did, unknown_did, ddo.did])
+    assert [result.did for result in results] == [ddo.did, unknown_did, ddo.did]
+    assert results[0].error is None and results[0].ddo.did == ddo.did
+    assert results[2].error is None and results[2].ddo.did == ddo.did
+    assert results[1].ddo is None and results[1].error is not None
+    publisher_ocean_instance.assets.retire(ddo.did)
+
+
+def test_ocean_assets_events_index(publisher_ocean_instance, metadata):
+    ocn = publisher_ocean_instance
+    publisher = ocn.main_account
+    ddo = ocn.assets.create(metadata, publisher)
+    events_indexer = EventsIndexer(
+        ocn.keeper, EventsIndexStorage(':memory:'),
+        from_block=ocn.keeper.did_registry.get_block_number_updated(ddo.asset_id)
+    )
+    events_indexer.sync()
+    storage = events_indexer.storage
+    asset_id = ddo.asset_id.lower()
+    assert asset_id in storage.get_owner_dids(publisher.address)
+    assert storage.get_providers(asset_id) == ocn.keeper.did_registry.get_did_providers(
+        ddo.asset_id)
+    ocn.assets.retire(ddo.did)
+
+
+def test_ocean_assets_order_many(publisher_ocean_instance, consumer_ocean_instance):
+    consumer = consumer_ocean_instance.main_account
+    if consumer_ocean_instance.accounts.balance(consumer).ocn == 0:
+        consumer_ocean_instance.accounts.request_tokens(consumer, 100)
+
+    assets = [create_asset(publisher_ocean_instance) for _ in range(4)]
+    orders = [(asset.did, asset.get_service(ServiceTypes.ASSET_ACCESS).index)
+              for asset in assets]
+    results = consumer_ocean_instance.assets.order_many(orders, consumer)
+    assert [(result.did, result.index) for result in results] == orders
+    keeper = consumer_ocean_instance.keeper
+    for result in results:
+        assert result.error is None, f'ordering {result.did} failed: {result.error}'
+        assert keeper.escrow_access_secretstore_template.get_agreement_consumer(
+            result.agreement_id) == consumer.address
+
+    # The rewards of all the agreements are locked, their transactions are sent concurrently
+    # by the agreements callbacks from the same consumer account.
+    storage = consumer_ocean_instance.agreements._agreements_storage
+    for result in results:
+        assert keeper.lock_reward_condition.subscribe_condition_fulfilled(
+            result.agreement_id,
+            60,
+            log_event(keeper.lock_reward_condition.FULFILLED_EVENT),
+            (),
+            wait=True
+        ), f'reward of {result.agreement_id} not locked'
+        deadline = time.monotonic() + 10
+        while storage.get_agreement(result.agreement_id).status != \
+                AgreementStates.REWARD_LOCKED and time.monotonic() < deadline:
+            time.sleep(0.5)
+        assert storage.get_agreement(result.agreement_id).status == \
+            AgreementStates.REWARD_LOCKED
+
+    for asset in assets:
+        publisher_ocean_instance.assets.retire(asset.did)
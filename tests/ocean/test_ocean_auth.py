@@ -48,3 +48,15 @@ def test_restore_token(publisher_ocean_instance):
     assert ocn_auth.check(token) == acc.address, 'invalid token, check failed.'
     # verify it is saved
     assert ocn_auth.restore(acc) == token, 'Restoring token failed.'
+
+
+def test_check_many_tokens():
+    ocn_auth = OceanAuth(Keeper.get_instance(), ':memory:', tokens_cache_size=10)
+    acc = get_publisher_account()
+    token = ocn_auth.get(acc)
+    sig = token.split('-')[0]
+
+    assert ocn_auth.check_many([token, sig, token]) == [acc.address, '0x0', acc.address]
+    assert ocn_auth._tokens_cache.stats()['size'] == 1
+    assert ocn_auth.check(token) == acc.address
+    assert ocn_auth._tokens_cache.hits == 1
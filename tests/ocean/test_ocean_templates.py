@@ -1,2 +1,12 @@
 #  Copyright 2018 Ocean Protocol Foundation
 #  SPDX-License-Identifier: Apache-2.0
+
+
+def test_ocean_templates_is_approved(publisher_ocean_instance):
+    templates = publisher_ocean_instance.templates
+    keeper = publisher_ocean_instance.keeper
+    access_template = keeper.escrow_access_secretstore_template.address
+    approved = keeper.template_manager.is_template_approved(access_template)
+    assert templates.is_approved(access_template) == approved
+    assert templates.is_approved_many([access_template, access_template]) == [approved, approved]
+    assert templates._approved_cache.hits >= 2
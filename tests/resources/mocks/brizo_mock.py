@@ -42,6 +42,15 @@ class BrizoMock(object):
             with open(os.path.join(destination_folder, os.path.basename(f['url'])), 'w') as of:
                 of.write(f'mock data {service_agreement_id}.{service_endpoint}.{account_address}')
 
+    @staticmethod
+    def consume_stream(service_agreement_id, service_endpoint, account_address, files,
+                       index=None, *_, **__):
+        for i, f in enumerate(files):
+            if index is None or index == i:
+                yield i, os.path.basename(f['url']), iter(
+                    [f'mock data {service_agreement_id}.{service_endpoint}.{account_address}'
+                     .encode()])
+
     @staticmethod
     def execute_service(agreement_id, service_endpoint, consumer_account, workflow_ddo):
         return True
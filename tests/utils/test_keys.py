@@ -0,0 +1,11 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from squid_py.utils.keys import to_index_key
+
+
+def test_to_index_key():
+    key = '0x' + '0a' * 32
+    assert to_index_key('did:op:' + '0a' * 32) == key
+    assert to_index_key(bytes.fromhex('0a' * 32)) == key
+    assert to_index_key(key.upper()[2:]) == key
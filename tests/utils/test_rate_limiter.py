@@ -0,0 +1,15 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import time
+
+from squid_py.utils.rate_limiter import RateLimiter
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(1000)
+    start = time.monotonic()
+    # The first second of rate is available at once, the rest waits for the refill.
+    for _ in range(3):
+        limiter.consume(500)
+    assert 0.4 < time.monotonic() - start < 1
@@ -0,0 +1,37 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+from squid_py.utils.timer_wheel import TimerWheel
+
+
+def test_timer_wheel_expiration():
+    wheel = TimerWheel(tick=1.0, size=4)
+    start = wheel._last_tick
+    wheel.schedule(1, 'a', start)
+    wheel.schedule(2.5, 'b', start)
+    wheel.schedule(10, 'c', start)
+
+    assert wheel.advance(start + 0.5) == []
+    assert wheel.advance(start + 1) == ['a']
+    assert wheel.advance(start + 3) == ['b']
+    # 'c' is in the same slot as 'b' but expires after two more turns of the wheel.
+    assert wheel.advance(start + 9) == []
+    assert wheel.advance(start + 10) == ['c']
+    assert wheel.advance(start + 30) == []
+
+
+def test_timer_wheel_never_expires_early():
+    wheel = TimerWheel(tick=1.0, size=4)
+    start = wheel._last_tick
+    # Scheduled near the end of the current tick.
+    wheel.schedule(1, 'a', start + 0.9)
+    wheel.schedule(0.05, 'b', start + 0.9)
+
+    assert wheel.advance(start + 1) == ['b']
+    assert wheel.advance(start + 1.8) == []
+    assert wheel.advance(start + 2) == ['a']
+
+    # The wheel is behind the current time when it was not advanced for a while.
+    wheel.schedule(2, 'c', start + 5.5)
+    assert wheel.advance(start + 7) == []
+    assert wheel.advance(start + 8) == ['c']
@@ -0,0 +1,55 @@
+#  Copyright 2018 Ocean Protocol Foundation
+#  SPDX-License-Identifier: Apache-2.0
+
+import time
+
+from squid_py.utils.ttl_cache import TTLCache
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 2}
+
+
+def test_ttl_cache_expiry():
+    cache = TTLCache(10, ttl=0.1)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.2)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+    # an entry ttl overrides the cache ttl, an expired entry is not stored
+    cache.set('b', 1, ttl=10)
+    cache.set('c', 1, ttl=0)
+    time.sleep(0.2)
+    assert cache.get('b') == 1
+    assert cache.get('c') is None
+
+
+def test_ttl_cache_invalidation():
+    cache = TTLCache(10)
+    cache.set('a', 1)
+    version = cache.version
+    assert cache.pop('a') == 1
+    assert cache.get('a') is None
+    # a value fetched before the invalidation is not stored
+    cache.set('a', 1, version)
+    assert cache.get('a') is None
+    cache.set('a', 2, cache.version)
+    assert cache.get('a') == 2
+    cache.clear()
+    assert cache.get('a') is None
+
+
+def test_ttl_cache_disabled():
+    cache = TTLCache(0)
+    cache.set('a', 1)
+    assert cache.get('a') is None